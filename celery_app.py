@@ -6,6 +6,9 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+UPLOAD_QUEUE = "upload"
+EXTRACT_QUEUE = "extract"
+
 
 def make_celery() -> Celery:
     """Create and configure a Celery application instance.
@@ -25,6 +28,12 @@ def make_celery() -> Celery:
         result_expires=3600,  # 1 hour
         worker_send_task_events=True,
         task_send_sent_event=True,
+        # Slow LLM extractions get their own queue so quick uploads never
+        # wait behind them (see scripts/run_worker.py)
+        task_routes={
+            "tasks.extract_form": {"queue": EXTRACT_QUEUE},
+            "tasks.upload_image": {"queue": UPLOAD_QUEUE},
+        },
     )
 
     # ---- Python 3.13 compatibility fallback ----
@@ -1,12 +1,15 @@
 import base64
 import json
+from functools import lru_cache
 from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
 
 # from pydantic.v1 import SecretStr  # Not needed for newer langchain versions
-from properties.prompts import PROMPT_SAMPLES
+from properties.prompts import TICKET_SYSTEM_PROMPT, TICKET_USER_TEMPLATE
 from properties.config import Configuration
 
+_SYSTEM_MESSAGE = SystemMessage(content=TICKET_SYSTEM_PROMPT)
+
 
 class TicketChatBot:
     def __init__(self, config: Configuration):
@@ -25,18 +28,16 @@ class TicketChatBot:
             temperature=float(self.config.OPENAI_TEMPERATURE),
             api_key=self.config.OPENAI_KEY,
         )
-        self.prompt_config = PROMPT_SAMPLES["ticket_information"]
 
     def encode_image_base64(self, image_path: str) -> str:
         with open(image_path, "rb") as f:
             return base64.b64encode(f.read()).decode("utf-8")
 
     def build_messages(self, ocr_text: str, image_base64: str) -> list:
-        system_prompt = self.prompt_config["system_prompt"]
-        user_prompt = self.prompt_config["user_prompt"].format(context=ocr_text)
+        user_prompt = TICKET_USER_TEMPLATE.substitute(context=ocr_text)
 
         return [
-            SystemMessage(content=system_prompt),
+            _SYSTEM_MESSAGE,
             HumanMessage(
                 content=[
                     {"type": "text", "text": user_prompt},
@@ -62,7 +63,14 @@ class TicketChatBot:
 
     def analyze_ticket_sync(self, image_path: str, ocr_text: str) -> dict:
         # New synchronous helper for Celery tasks
-        image_base64 = self.encode_image_base64(image_path)
+        return self._analyze_base64_sync(self.encode_image_base64(image_path), ocr_text)
+
+    def analyze_ticket_bytes_sync(self, image_bytes: bytes, ocr_text: str) -> dict:
+        # Synchronous helper for images already in memory (e.g. read from GCS)
+        image_base64 = base64.b64encode(image_bytes).decode("utf-8")
+        return self._analyze_base64_sync(image_base64, ocr_text)
+
+    def _analyze_base64_sync(self, image_base64: str, ocr_text: str) -> dict:
         messages = self.build_messages(ocr_text, image_base64)
         response = self.llm.invoke(messages)
         content = (
@@ -78,3 +86,9 @@ class TicketChatBot:
         except json.JSONDecodeError as e:
             print("❌ JSON parsing error:", e)
             return {"error": "Invalid JSON format", "raw_response": content}
+
+
+@lru_cache(maxsize=1)
+def get_bot() -> TicketChatBot:
+    """Process-wide TicketChatBot; the LLM client is built once and reused."""
+    return TicketChatBot(Configuration())
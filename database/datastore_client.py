@@ -0,0 +1,11 @@
+"""
+Shared Cloud Datastore client.
+
+The client keeps its own gRPC channel pool and is safe for concurrent use,
+so one instance per process is shared by every service.
+"""
+
+from google.cloud import datastore
+
+# Credentials should be set via GOOGLE_APPLICATION_CREDENTIALS environment variable
+client = datastore.Client()
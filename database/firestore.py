@@ -1,7 +1,11 @@
 import os
+import threading
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple, Any
 
+from cachetools import TTLCache
+from google.api_core.exceptions import Aborted, DeadlineExceeded
+from google.api_core.retry import Retry, if_exception_type
 from google.cloud import firestore
 from google.cloud.firestore_v1.base_query import FieldFilter
 from pydantic import BaseModel
@@ -17,6 +21,17 @@ else:
     db = firestore.Client()
 
 
+# Recently read image sizes, keyed by (collection, image name). Writes and
+# deletes through this module evict the entry.
+_size_cache = TTLCache(maxsize=2048, ttl=60)
+_size_cache_lock = threading.Lock()
+
+
+def _evict_size(collection_name: str, image_name: str):
+    with _size_cache_lock:
+        _size_cache.pop((collection_name, image_name), None)
+
+
 class ImageData(BaseModel):
     """
     Pydantic model representing image metadata stored in Firestore.
@@ -30,6 +45,22 @@ class ImageData(BaseModel):
     Size: float = 0.0
 
 
+def _to_dict(data) -> dict:
+    """Convert ImageData, a dict or a plain object to a Firestore payload."""
+    if hasattr(data, "dict"):
+        return data.dict()
+    if isinstance(data, dict):
+        return data
+    if hasattr(data, "__dict__"):
+        return data.__dict__
+    # Fallback: convert to string representation
+    return {"data": str(data)}
+
+
+# Batched writes are plain sets, so replaying one after a transient error is safe
+_BATCH_RETRY = Retry(predicate=if_exception_type(Aborted, DeadlineExceeded))
+
+
 def upsert_image(data, collection_name: str, key_upload: str):
     """
     Create or update an image document in Firestore.
@@ -38,22 +69,31 @@ def upsert_image(data, collection_name: str, key_upload: str):
         data: Image metadata to be stored (can be ImageData object or dict).
     """
     doc_ref = db.collection(collection_name).document(key_upload)
-
-    # Convert ImageData to dict if needed
-    if hasattr(data, "dict"):
-        data_dict = data.dict()
-    elif isinstance(data, dict):
-        data_dict = data
-    elif hasattr(data, "__dict__"):
-        data_dict = data.__dict__
-    else:
-        # Fallback: convert to string representation
-        data_dict = {"data": str(data)}
+    data_dict = _to_dict(data)
 
     print(f"[Firestore] Upserting data type: {type(data)}")
     print(f"[Firestore] Converted dict: {data_dict}")
 
     doc_ref.set(data_dict)
+    _evict_size(collection_name, key_upload)
+
+
+def batched_upsert(docs: List[Tuple[str, str, Any]], merge: bool = False):
+    """
+    Write several documents in a single Firestore batch (one round trip).
+
+    Args:
+        docs: (collection name, document id, data) tuples; data may be an
+            ImageData object or a dict, as for upsert_image.
+        merge: Merge into existing documents instead of replacing them.
+    """
+    batch = db.batch()
+    for collection_name, key_upload, data in docs:
+        doc_ref = db.collection(collection_name).document(key_upload)
+        batch.set(doc_ref, _to_dict(data), merge=merge)
+    batch.commit(retry=_BATCH_RETRY)
+    for collection_name, key_upload, _ in docs:
+        _evict_size(collection_name, key_upload)
 
 
 def get_image(image_name: str, collection_name: str) -> Optional[dict]:
@@ -72,6 +112,44 @@ def get_image(image_name: str, collection_name: str) -> Optional[dict]:
     return None
 
 
+def get_images(image_names: List[str], collection_name: str) -> dict:
+    """
+    Retrieve several image documents in one round trip.
+
+    Args:
+        image_names (List[str]): The IDs (ImageName) of the documents.
+
+    Returns:
+        dict: Document data keyed by ImageName; missing documents are omitted.
+    """
+    collection = db.collection(collection_name)
+    refs = [collection.document(name) for name in image_names]
+    return {doc.id: doc.to_dict() for doc in db.get_all(refs) if doc.exists}
+
+
+def get_image_size(image_name: str, collection_name: str) -> float:
+    """
+    Read only the Size field of an image document (cached briefly).
+
+    Args:
+        image_name (str): The ID (ImageName) of the document.
+
+    Returns:
+        float: Stored size in MB, or 0.0 if the document or field is missing.
+    """
+    cache_key = (collection_name, image_name)
+    with _size_cache_lock:
+        size = _size_cache.get(cache_key)
+    if size is not None:
+        return size
+
+    doc = db.collection(collection_name).document(image_name).get(field_paths=["Size"])
+    size = (doc.to_dict() or {}).get("Size", 0.0) if doc.exists else 0.0
+    with _size_cache_lock:
+        _size_cache[cache_key] = size
+    return size
+
+
 def delete_image(image_name: str, collection_name: str):
     """
     Delete an image document from Firestore.
@@ -80,6 +158,7 @@ def delete_image(image_name: str, collection_name: str):
         image_name (str): The ID (ImageName) of the document.
     """
     db.collection(collection_name).document(image_name).delete()
+    _evict_size(collection_name, image_name)
 
 
 def list_images(
@@ -1,22 +1,114 @@
+import mimetypes
+import os
+from functools import lru_cache
+from typing import BinaryIO, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
 from google.cloud import storage
 
+GCS_PUBLIC_HOST = "storage.googleapis.com"
+
+
+@lru_cache(maxsize=1)
+def get_storage_client() -> storage.Client:
+    """Process-wide storage client; credentials and HTTP session are set up once."""
+    return storage.Client()
+
+
+# Uploads larger than this go through resumable uploads in chunks of this size
+RESUMABLE_CHUNK_SIZE = 8 * 1024 * 1024
+
 
 def upload_image_to_gcs(
-    bucket_name: str, source_file_path: str, destination_blob_name: str
+    bucket_name: str,
+    source_file_path: str,
+    destination_blob_name: str,
+    size: Optional[int] = None,
 ):
     """
     Uploads an image to the Google Cloud Storage bucket.
+
+    Images up to RESUMABLE_CHUNK_SIZE go up in a single multipart request;
+    larger ones use a resumable upload in chunks of that size. The blob name
+    is expected to be new (timestamped), so the upload is made conditional
+    on the object not existing, which also lets the client retry it safely.
+    Pass `size` (bytes) if already known to skip a stat of the file.
     """
-    storage_client = storage.Client()
+    storage_client = get_storage_client()
     bucket = storage_client.bucket(bucket_name)
     blob = bucket.blob(destination_blob_name)
-    blob.upload_from_filename(source_file_path)
+    if size is None:
+        size = os.path.getsize(source_file_path)
+    if size > RESUMABLE_CHUNK_SIZE:
+        blob.chunk_size = RESUMABLE_CHUNK_SIZE
+    blob.upload_from_filename(source_file_path, if_generation_match=0)
     print(f"File {source_file_path} uploaded to {destination_blob_name}.")
 
 
+def upload_fileobj_to_gcs(
+    bucket_name: str,
+    file_obj: BinaryIO,
+    destination_blob_name: str,
+    size: Optional[int] = None,
+    content_type: Optional[str] = None,
+    if_generation_match: Optional[int] = None,
+):
+    """
+    Stream an open file object to the Google Cloud Storage bucket.
+
+    Files over RESUMABLE_CHUNK_SIZE are sent as a chunked resumable upload;
+    smaller ones go up in a single request. The content type defaults to
+    the one guessed from the blob name, as upload_from_filename does.
+    Pass if_generation_match=0 to fail with PreconditionFailed instead of
+    overwriting an existing object.
+    """
+    storage_client = get_storage_client()
+    bucket = storage_client.bucket(bucket_name)
+    blob = bucket.blob(destination_blob_name)
+    if size is None or size > RESUMABLE_CHUNK_SIZE:
+        blob.chunk_size = RESUMABLE_CHUNK_SIZE
+    if content_type is None:
+        content_type = mimetypes.guess_type(destination_blob_name)[0]
+    blob.upload_from_file(
+        file_obj,
+        rewind=True,
+        size=size,
+        content_type=content_type,
+        if_generation_match=if_generation_match,
+    )
+
+
+def parse_gcs_url(url: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a GCS object URL into (bucket name, blob name).
+
+    Accepts gs://bucket/blob and https://storage.googleapis.com/bucket/blob
+    (the form stored in ImagePath). Returns None for any other URL.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == "gs":
+        bucket_name, blob_name = parsed.netloc, parsed.path.lstrip("/")
+    elif parsed.scheme == "https" and parsed.netloc == GCS_PUBLIC_HOST:
+        bucket_name, _, blob_name = parsed.path.lstrip("/").partition("/")
+    else:
+        return None
+    if not bucket_name or not blob_name:
+        return None
+    return bucket_name, unquote(blob_name)
+
+
+def download_blob_to_memory(bucket_name: str, blob_name: str) -> bytes:
+    """
+    Download a blob's contents into memory (no temporary file).
+    """
+    storage_client = get_storage_client()
+    bucket = storage_client.bucket(bucket_name)
+    return bucket.blob(blob_name).download_as_bytes()
+
+
 def delete_blobs_with_prefix(bucket_name: str, prefix: str):
     """Delete all blobs beginning with prefix (simulate folder delete)."""
-    storage_client = storage.Client()
+    storage_client = get_storage_client()
     bucket = storage_client.bucket(bucket_name)
     blobs = bucket.list_blobs(prefix=prefix)
     for blob in blobs:
@@ -26,7 +118,7 @@ def delete_blobs_with_prefix(bucket_name: str, prefix: str):
 
 def rename_folder(bucket_name: str, old_prefix: str, new_prefix: str):
     """Rename a 'folder' by copying blobs then deleting originals."""
-    storage_client = storage.Client()
+    storage_client = get_storage_client()
     bucket = storage_client.bucket(bucket_name)
     blobs = bucket.list_blobs(prefix=old_prefix)
     for blob in blobs:
@@ -1,9 +1,12 @@
 import uvicorn
+import aiofiles
+import asyncio
 import os
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from fastapi import (
     FastAPI,
     UploadFile,
@@ -12,13 +15,18 @@ from fastapi import (
     Form,
     Depends,
     Request,
+    Response,
     status,
 )
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from cachetools import TTLCache
 
 # from middleware.auth import verify_api_key  # No longer needed - using user authentication
 from middleware.rate_limiter import (
-    limiter,
+    rate_limit,
+    check_rate_limit,
+    parse_rate,
+    RateLimitExceeded,
     RATE_LIMIT_UPLOAD,
     RATE_LIMIT_AI,
     RATE_LIMIT_GENERAL,
@@ -30,24 +38,24 @@ from middleware.error_handler import (
     generic_exception_handler,
     rate_limit_handler,
 )
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
 from fastapi.exceptions import RequestValidationError
-from chain.completions import TicketChatBot
+from chain.completions import get_bot
 from properties.config import Configuration
 from utils.file_validation import validate_upload_file, FileValidationError
 from utils.path_sanitizer import sanitize_folder_path
-from services.form_extraction_service import FormExtractionService
+from services.form_extraction_service import get_form_extraction_service
 from services.auth_service import (
     authenticate_user,
     create_access_token,
     update_last_login,
     ACCESS_TOKEN_EXPIRE_MINUTES,
+    AUTHENTICATE_HEADERS,
 )
 from models.user import UserLogin, Token, User
 from models.activity_log import ActivityLogResponse
 from middleware.user_auth import get_current_active_user, get_current_admin_user
 from middleware.activity_logger import ActivityLoggingMiddleware
+from services.datastore_activity_service import datastore_activity_service
 from datetime import timedelta
 from typing import Optional
 
@@ -55,7 +63,9 @@ from database.firestore import (
     db,
     ImageData,
     upsert_image,
+    batched_upsert,
     get_image,
+    get_images,
     delete_image,
     list_images,
     upsert_folder,
@@ -64,29 +74,59 @@ from database.firestore import (
     rename_folder as firestore_rename_folder,
 )
 from database.ggc_storage import (
+    get_storage_client,
     upload_image_to_gcs,
     delete_blobs_with_prefix,
     rename_folder as gcs_rename_folder,
 )
-from utils.file_processing import download_image_from_url, extract_filename_from_url
+from utils.file_processing import (
+    close_http_session,
+    download_image_from_url,
+    extract_filename_from_url,
+)
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from celery_app import celery_app
-from tasks import upload_image_task, extract_form_task
+from tasks import upload_image_task, extract_form_task, timestamp_name
+from celery import group
 from celery.result import AsyncResult
 
-# Configure logger
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
+# Configure logger: request handlers only enqueue records, a background
+# listener thread does the actual (blocking) stream I/O.
+_log_queue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+)
+_log_listener = QueueListener(
+    _log_queue, _log_stream_handler, respect_handler_level=True
 )
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)], force=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Firestore Image Metadata API")
 
-# Add rate limiting
-app.state.limiter = limiter
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    datastore_activity_service.start()
+    yield
+    # Write out any activity logs still waiting for a batch
+    await datastore_activity_service.shutdown()
+    await close_http_session()
+
+
+app = FastAPI(
+    title="Firestore Image Metadata API",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+# Add rate limiting (enforced per route via the rate_limit dependency)
 app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
-app.add_middleware(SlowAPIMiddleware)
 
 # Add activity logging middleware
 app.add_middleware(ActivityLoggingMiddleware)
@@ -101,11 +141,13 @@ config = Configuration()
 config.validate_required_config()
 
 # Initialize services
-bot = TicketChatBot(config)
-form_extraction_service = FormExtractionService(config)
+bot = get_bot()
+form_extraction_service = get_form_extraction_service()
 
 
 class ExtractFormData(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     FolderPath: str = ""
     Status: str
     ImagePath: str  # URL of the image
@@ -133,6 +175,16 @@ class FolderRenameData(BaseModel):
     newPath: str
 
 
+class ExtractFormBatchData(BaseModel):
+    """Request model for enqueuing several extractions at once."""
+
+    # Each item is charged against the AI rate limit, so a batch can never
+    # exceed what one client may queue in a window
+    items: list[ExtractFormData] = Field(
+        ..., min_length=1, max_length=parse_rate(RATE_LIMIT_AI)[0]
+    )
+
+
 # Configure CORS with restricted origins and headers
 app.add_middleware(
     CORSMiddleware,
@@ -145,14 +197,40 @@ app.add_middleware(
 # Create upload directory
 os.makedirs(config.UPLOAD_FOLDER, exist_ok=True)
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def save_upload_file(file: UploadFile, local_path: str):
+    """Stream an uploaded file to disk without blocking the event loop."""
+    async with aiofiles.open(local_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await f.write(chunk)
+
+
+# Short-lived in-process caches for listing endpoints. Handlers run on the
+# event loop thread, so check-then-set never interleaves and needs no lock.
+LISTING_CACHE_TTL = 15
+LISTING_CACHE_CONTROL = f"private, max-age={LISTING_CACHE_TTL}"
+_folders_cache = TTLCache(maxsize=1, ttl=LISTING_CACHE_TTL)
+_images_cache = TTLCache(maxsize=1024, ttl=LISTING_CACHE_TTL)
+
+
+def invalidate_listing_caches():
+    """Drop cached folder/image listings after a write."""
+    _folders_cache.clear()
+    _images_cache.clear()
+
 
 # ============================================
 # Authentication Endpoints
 # ============================================
 
 
-@app.post("/auth/login", response_model=Token)
-@limiter.limit(RATE_LIMIT_GENERAL)
+@app.post(
+    "/auth/login",
+    response_model=Token,
+    dependencies=[Depends(rate_limit(RATE_LIMIT_GENERAL))],
+)
 async def login(request: Request, user_login: UserLogin):
     """
     User login endpoint
@@ -161,13 +239,13 @@ async def login(request: Request, user_login: UserLogin):
     """
     logger.info(f"Login attempt for user: {user_login.username}")
 
-    user = authenticate_user(user_login.username, user_login.password)
+    user = await authenticate_user(user_login.username, user_login.password)
     if not user:
         logger.warning(f"Failed login attempt for user: {user_login.username}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Bearer"},
+            headers=AUTHENTICATE_HEADERS,
         )
 
     # Update last login time
@@ -214,8 +292,7 @@ async def logout(current_user: User = Depends(get_current_active_user)):
 # ============================================
 
 
-@app.post("/upload-image/")
-@limiter.limit(RATE_LIMIT_UPLOAD)
+@app.post("/upload-image/", dependencies=[Depends(rate_limit(RATE_LIMIT_UPLOAD))])
 async def upload_image(
     request: Request,
     status: str = Form(...),
@@ -223,10 +300,12 @@ async def upload_image(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user),
 ):
-    logger.info("Received request to upload image")
-    logger.info(f"Status: {status}")
-    logger.info(
-        f"File: {file.filename}, size: {file.size}, content_type: {file.content_type}"
+    logger.debug(
+        "Received upload: status=%s file=%s size=%s content_type=%s",
+        status,
+        file.filename,
+        file.size,
+        file.content_type,
     )
 
     # Sanitize folder path to prevent path traversal
@@ -255,16 +334,15 @@ async def upload_image(
     local_path = os.path.join(config.UPLOAD_FOLDER, image_name)
 
     # Save file temporarily
-    with open(local_path, "wb") as f:
-        f.write(await file.read())
-    logger.info(f"Saved image locally at {local_path}")
+    await save_upload_file(file, local_path)
+    logger.debug("Saved image locally at %s", local_path)
 
     try:
         # Validate the uploaded file
         validate_upload_file(
             local_path, config.MAX_FILE_SIZE, config.ALLOWED_EXTENSIONS
         )
-        logger.info(f"File validation successful for {image_name}")
+        logger.debug("File validation successful for %s", image_name)
 
         destination_blob_name = (
             f"{safe_folder_path}/{image_name}" if safe_folder_path else image_name
@@ -275,8 +353,9 @@ async def upload_image(
             bucket_name=config.BUCKET_NAME,
             source_file_path=local_path,
             destination_blob_name=destination_blob_name,
+            size=file.size,
         )
-        logger.info(f"Uploaded image to GCS as {destination_blob_name}")
+        logger.debug("Uploaded image to GCS as %s", destination_blob_name)
 
         gcs_url = f"https://storage.googleapis.com/{config.BUCKET_NAME}/{destination_blob_name}"
         size_val = round((file.size or 0) / (1024 * 1024), 2)
@@ -293,26 +372,24 @@ async def upload_image(
         upsert_image(
             image_data, config.COLLECTION_NAME_IMAGE_DETAIL, image_data.ImageName
         )
-        logger.info(f"Saved image metadata to Firestore: {destination_blob_name}")
+        invalidate_listing_caches()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Saved image metadata to Firestore: {destination_blob_name}")
 
     except FileValidationError as e:
         logger.error(f"File validation failed: {str(e)}")
-        # Clean up the temporary file
-        if os.path.exists(local_path):
-            os.remove(local_path)
         raise HTTPException(status_code=400, detail=f"File validation failed: {str(e)}")
     except Exception as e:
         logger.error(f"Upload failed: {str(e)}")
-        # Clean up the temporary file
-        if os.path.exists(local_path):
-            os.remove(local_path)
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
     finally:
         # Always clean up temporary file
-        if os.path.exists(local_path):
-            os.remove(local_path)
+        try:
+            os.unlink(local_path)
+        except FileNotFoundError:
+            pass
 
-    return JSONResponse(content={"message": "Image uploaded and saved successfully."})
+    return ORJSONResponse(content={"message": "Image uploaded and saved successfully."})
 
 
 @app.post("/images/", response_model=dict)
@@ -323,6 +400,7 @@ async def create_or_update_image(
     Create or update an image record in Firestore.
     """
     upsert_image(data, config.COLLECTION_NAME_IMAGE_DETAIL, data.ImageName)
+    invalidate_listing_caches()
     return {"message": "Image data saved successfully."}
 
 
@@ -345,16 +423,25 @@ async def remove_image(
     Delete an image record from Firestore.
     """
     delete_image(image_name, config.COLLECTION_NAME_IMAGE_DETAIL)
+    invalidate_listing_caches()
     return {"message": f"Image '{image_name}' deleted successfully."}
 
 
 @app.get("/images/")
-async def get_all_images(folderPath: str = "", page: int = 1, limit: int = 20):
+async def get_all_images(
+    response: Response, folderPath: str = "", page: int = 1, limit: int = 20
+):
     """
     Retrieve image records. If folderPath provided, filter by that path.
     """
     # Sanitize folder path if provided
     safe_folder_path = sanitize_folder_path(folderPath) if folderPath else None
+    response.headers["Cache-Control"] = LISTING_CACHE_CONTROL
+
+    cache_key = (safe_folder_path, page, limit)
+    cached = _images_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
     # Use optimized Firestore query with filtering and pagination at database level
     data, total = list_images(
@@ -364,7 +451,9 @@ async def get_all_images(folderPath: str = "", page: int = 1, limit: int = 20):
         limit=limit,
     )
 
-    return {"data": data, "total": total}
+    result = {"data": data, "total": total}
+    _images_cache[cache_key] = result
+    return result
 
 
 # Folder endpoints
@@ -372,9 +461,14 @@ async def get_all_images(folderPath: str = "", page: int = 1, limit: int = 20):
 
 # Get folders
 @app.get("/folders/")
-async def list_folders():
-    folders = firestore_list_folders()
-    return {"folders": folders}
+async def list_folders(response: Response):
+    response.headers["Cache-Control"] = LISTING_CACHE_CONTROL
+    cached = _folders_cache.get(())
+    if cached is not None:
+        return cached
+    result = {"folders": firestore_list_folders()}
+    _folders_cache[()] = result
+    return result
 
 
 # Create folder
@@ -389,6 +483,7 @@ async def create_folder(
     # Sanitize folder path
     safe_folder_path = sanitize_folder_path(folder_path)
     upsert_folder(safe_folder_path)
+    invalidate_listing_caches()
     return {
         "message": "Folder created or already exists",
         "folderPath": safe_folder_path,
@@ -406,6 +501,7 @@ async def delete_folder(
     # ensure folder exists
     firestore_delete_folder(safe_folder_path)
     delete_blobs_with_prefix(config.BUCKET_NAME, f"{safe_folder_path}/")
+    invalidate_listing_caches()
     return {"message": "Folder deleted", "folderPath": safe_folder_path}
 
 
@@ -425,6 +521,7 @@ async def rename_folder(
 
     firestore_rename_folder(safe_old_path, safe_new_path)
     gcs_rename_folder(config.BUCKET_NAME, f"{safe_old_path}/", f"{safe_new_path}/")
+    invalidate_listing_caches()
     return {
         "message": "Folder renamed",
         "oldPath": safe_old_path,
@@ -432,8 +529,7 @@ async def rename_folder(
     }
 
 
-@app.post("/ExtractForm")
-@limiter.limit(RATE_LIMIT_AI)
+@app.post("/ExtractForm", dependencies=[Depends(rate_limit(RATE_LIMIT_AI))])
 async def extract_form(
     request: Request,
     data: ExtractFormData,
@@ -444,7 +540,7 @@ async def extract_form(
 
     try:
         # Convert Pydantic model to dict for service
-        data_dict = data.dict()
+        data_dict = data.model_dump()
 
         # Use the form extraction service
         result = await form_extraction_service.process_form_extraction(data_dict)
@@ -495,8 +591,7 @@ async def get_form_extract_information(data: GetFormInfoData):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@app.post("/queue/upload-image")
-@limiter.limit(RATE_LIMIT_UPLOAD)
+@app.post("/queue/upload-image", dependencies=[Depends(rate_limit(RATE_LIMIT_UPLOAD))])
 async def queue_upload_image(
     request: Request,
     status: str = Form(...),
@@ -510,60 +605,156 @@ async def queue_upload_image(
     ext = os.path.splitext(file.filename or "")[1].lower()
     if ext not in [".jpg", ".jpeg", ".png", ".bmp", ".webp"]:
         raise HTTPException(status_code=400, detail="Unsupported image format.")
-    os.makedirs(config.UPLOAD_FOLDER, exist_ok=True)
     temp_name = f"enqueue_{uuid.uuid4().hex}{ext}"
     temp_path = os.path.join(config.UPLOAD_FOLDER, temp_name)
-    with open(temp_path, "wb") as f:
-        f.write(await file.read())
-    task = upload_image_task.apply_async(
-        args=[temp_path, file.filename, status, safe_folder_path]
+    await save_upload_file(file, temp_path)
+    # Named here so the worker's autoretries all target the same blob
+    image_name, created_at = timestamp_name(ext)
+    # apply_async does a blocking broker round trip; keep it off the event loop
+    task = await asyncio.to_thread(
+        upload_image_task.apply_async,
+        args=[
+            temp_path,
+            file.filename,
+            status,
+            safe_folder_path,
+            image_name,
+            created_at,
+        ],
     )
     return {"task_id": task.id, "status": "queued"}
 
 
-@app.post("/queue/extract-form")
-@limiter.limit(RATE_LIMIT_AI)
+# Sentinel returned by _prepare_extract_task for images already in progress
+ALREADY_PROCESSING = object()
+
+
+def _mark_processing(task_args: list):
+    """
+    Mark images as Processing in one batched write so FE reload sees it.
+
+    Callers must finish this before enqueueing; otherwise it could land after
+    the worker's Completed write and leave the image stuck as Processing.
+    """
+    try:
+        batched_upsert(
+            [
+                (
+                    config.COLLECTION_NAME_IMAGE_DETAIL,
+                    name,
+                    ImageData(
+                        Status="Processing",
+                        ImageName=name,
+                        ImagePath=path,
+                        CreatedAt=created,
+                        FolderPath=folder,
+                        Size=size,
+                    ),
+                )
+                for name, path, size, _, created, folder in task_args
+            ]
+        )
+    except Exception as e:  # non-fatal
+        logger.warning(f"Failed to pre-mark Processing: {e}")
+
+
+def _prepare_extract_task(data: ExtractFormData, existing: dict | None):
+    """
+    Validate an extraction request and build its task args.
+
+    Missing request fields are filled from the stored metadata (``existing``,
+    fetched by the caller off the event loop), so the worker never has to
+    read the document again.
+
+    Returns:
+        list | None | ALREADY_PROCESSING: Task args, None if the image does
+        not exist, or ALREADY_PROCESSING if it is already being extracted.
+    """
+    name, path, size, status, created, folder = (
+        data.ImageName,
+        data.ImagePath,
+        data.Size,
+        data.Status,
+        data.CreatedAt,
+        data.FolderPath,
+    )
+    if not existing:
+        return None
+    existing_get = existing.get
+    # Prevent duplicate enqueue if already processing
+    if existing_get("Status") == "Processing":
+        return ALREADY_PROCESSING
+    path = path or existing_get("ImagePath", "")
+    created = created or existing_get("CreatedAt", "")
+    folder = folder or existing_get("FolderPath", "")
+    size = size or existing_get("Size", 0.0)
+    return [name, path, size, status, created, folder]
+
+
+@app.post("/queue/extract-form", dependencies=[Depends(rate_limit(RATE_LIMIT_AI))])
 async def queue_extract_form(
     request: Request,
     data: ExtractFormData,
     current_user: User = Depends(get_current_active_user),
 ):
-    existing = get_image(data.ImageName, config.COLLECTION_NAME_IMAGE_DETAIL)
-    if not existing:
+    existing = await asyncio.to_thread(
+        get_image, data.ImageName, config.COLLECTION_NAME_IMAGE_DETAIL
+    )
+    args = _prepare_extract_task(data, existing)
+    if args is None:
         raise HTTPException(status_code=404, detail="Image not found. Upload first.")
-    # Prevent duplicate enqueue if already processing
-    if existing.get("Status") == "Processing":
+    if args is ALREADY_PROCESSING:
         return {"status": "already_processing"}
-    # Mark status as Processing immediately so FE reload sees it
-    try:
-        processing_meta = ImageData(
-            Status="Processing",
-            ImageName=data.ImageName,
-            ImagePath=data.ImagePath or existing.get("ImagePath", ""),
-            CreatedAt=data.CreatedAt or existing.get("CreatedAt", ""),
-            FolderPath=data.FolderPath or existing.get("FolderPath", ""),
-            Size=data.Size or existing.get("Size", 0.0),
-        )
-        upsert_image(
-            processing_meta, config.COLLECTION_NAME_IMAGE_DETAIL, data.ImageName
-        )
-    except Exception as e:  # non-fatal
-        logger.warning(f"Failed to pre-mark Processing for {data.ImageName}: {e}")
-    task = extract_form_task.apply_async(
-        args=[
-            data.ImageName,
-            data.ImagePath,
-            data.Size,
-            data.Status,
-            data.CreatedAt,
-            data.FolderPath,
-        ]
-    )
+    await asyncio.to_thread(_mark_processing, [args])
+    invalidate_listing_caches()
+    task = await asyncio.to_thread(extract_form_task.apply_async, args=args)
     return {"task_id": task.id, "status": "queued"}
 
 
-@app.get("/tasks/{task_id}")
-@limiter.limit(RATE_LIMIT_STATUS)
+@app.post("/queue/extract-form:batch")
+async def queue_extract_form_batch(
+    request: Request,
+    data: ExtractFormBatchData,
+    current_user: User = Depends(get_current_active_user),
+):
+    """Enqueue several extractions, sending all task messages in one go."""
+    results = []
+    signatures = []
+    # Enqueue each image once, even if the request lists it several times
+    items = list({item.ImageName: item for item in data.items}.values())
+    # One AI rate-limit hit per image, as if each were queued on its own
+    await check_rate_limit(request, RATE_LIMIT_AI, cost=len(items))
+    docs = await asyncio.to_thread(
+        get_images,
+        [item.ImageName for item in items],
+        config.COLLECTION_NAME_IMAGE_DETAIL,
+    )
+    for item in items:
+        args = _prepare_extract_task(item, docs.get(item.ImageName))
+        if args is None:
+            results.append({"ImageName": item.ImageName, "status": "not_found"})
+        elif args is ALREADY_PROCESSING:
+            results.append(
+                {"ImageName": item.ImageName, "status": "already_processing"}
+            )
+        else:
+            entry = {"ImageName": item.ImageName, "status": "queued"}
+            results.append(entry)
+            signatures.append((entry, extract_form_task.s(*args)))
+
+    if signatures:
+        await asyncio.to_thread(_mark_processing, [sig.args for _, sig in signatures])
+        invalidate_listing_caches()
+        group_result = await asyncio.to_thread(
+            group(sig for _, sig in signatures).apply_async
+        )
+        for (entry, _), task in zip(signatures, group_result.results):
+            entry["task_id"] = task.id
+
+    return {"results": results}
+
+
+@app.get("/tasks/{task_id}", dependencies=[Depends(rate_limit(RATE_LIMIT_STATUS))])
 async def get_task_status(request: Request, task_id: str):
     result: AsyncResult = celery_app.AsyncResult(task_id)
     resp = {"task_id": task_id, "state": result.state}
@@ -614,10 +805,7 @@ async def readiness_check():
 
     # Check GCS (try to get bucket)
     try:
-        from google.cloud import storage
-
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(config.BUCKET_NAME)
+        bucket = get_storage_client().bucket(config.BUCKET_NAME)
         bucket.exists()
         health_status["checks"]["gcs"] = "healthy"
     except Exception as e:
@@ -626,14 +814,13 @@ async def readiness_check():
         health_status["status"] = "not_ready"
 
     status_code = 200 if health_status["success"] else 503
-    return JSONResponse(content=health_status, status_code=status_code)
+    return ORJSONResponse(content=health_status, status_code=status_code)
 
 
 # ==================== DEBUG ENDPOINTS ====================
 
 
-@app.get("/debug/token")
-@limiter.limit(RATE_LIMIT_GENERAL)
+@app.get("/debug/token", dependencies=[Depends(rate_limit(RATE_LIMIT_GENERAL))])
 async def debug_token(
     request: Request, current_user: User = Depends(get_current_active_user)
 ):
@@ -650,8 +837,11 @@ async def debug_token(
 # ==================== ACTIVITY LOGGING ENDPOINTS ====================
 
 
-@app.get("/activity-logs", response_model=ActivityLogResponse)
-@limiter.limit(RATE_LIMIT_GENERAL)
+@app.get(
+    "/activity-logs",
+    response_model=ActivityLogResponse,
+    dependencies=[Depends(rate_limit(RATE_LIMIT_GENERAL))],
+)
 async def get_activity_logs(
     request: Request,
     user_id: Optional[str] = None,
@@ -661,12 +851,26 @@ async def get_activity_logs(
     end_date: Optional[datetime] = None,
     page: int = 1,
     limit: int = 50,
+    compact: bool = False,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_admin_user),
 ):
-    """Get activity logs with filtering and pagination (Admin only)"""
+    """
+    Get activity logs with filtering and pagination (Admin only)
+
+    `compact=true` returns list-view rows without metadata/user_agent;
+    `fields` (comma-separated) picks the returned fields explicitly.
+    Pass the previous response's `next_cursor` as `cursor` to fetch the next
+    page without the server skipping over all earlier pages.
+    """
     try:
-        from models.activity_log import ActivityLogFilter, ActivityType
-        from services.datastore_activity_service import datastore_activity_service
+        from models.activity_log import (
+            LIST_VIEW_FIELDS,
+            ActivityLogFilter,
+            ActivityLogSummary,
+            ActivityType,
+        )
 
         # Convert activity_type string to enum if provided
         activity_type_enum = None
@@ -679,6 +883,19 @@ async def get_activity_logs(
                     detail=f"Invalid activity_type: {activity_type}",
                 )
 
+        # Fields to project (None returns full log entries)
+        projection = LIST_VIEW_FIELDS if compact else None
+        if fields:
+            projection = [name.strip() for name in fields.split(",") if name.strip()]
+            invalid = set(projection) - (
+                ActivityLogSummary.model_fields.keys() - {"id"}
+            )
+            if invalid:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid fields: {', '.join(sorted(invalid))}",
+                )
+
         # Create filter
         filters = ActivityLogFilter(
             user_id=user_id,
@@ -688,6 +905,8 @@ async def get_activity_logs(
             end_date=end_date,
             page=page,
             limit=min(limit, 1000),  # Cap at 1000
+            projection=projection,
+            cursor=cursor,
         )
 
         # Get logs
@@ -695,6 +914,10 @@ async def get_activity_logs(
 
         return result
 
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to get activity logs: {str(e)}")
         raise HTTPException(
@@ -703,8 +926,9 @@ async def get_activity_logs(
         )
 
 
-@app.get("/activity-logs/my-activity")
-@limiter.limit(RATE_LIMIT_GENERAL)
+@app.get(
+    "/activity-logs/my-activity", dependencies=[Depends(rate_limit(RATE_LIMIT_GENERAL))]
+)
 async def get_my_activity_logs(
     request: Request,
     page: int = 1,
@@ -714,7 +938,6 @@ async def get_my_activity_logs(
     """Get current user's activity logs"""
     try:
         from models.activity_log import ActivityLogFilter
-        from services.datastore_activity_service import datastore_activity_service
 
         # Create filter for current user only
         filters = ActivityLogFilter(
@@ -736,8 +959,9 @@ async def get_my_activity_logs(
         )
 
 
-@app.get("/activity-logs/summary")
-@limiter.limit(RATE_LIMIT_GENERAL)
+@app.get(
+    "/activity-logs/summary", dependencies=[Depends(rate_limit(RATE_LIMIT_GENERAL))]
+)
 async def get_activity_summary(
     request: Request,
     user_id: Optional[str] = None,
@@ -746,7 +970,6 @@ async def get_activity_summary(
 ):
     """Get activity summary for a user (Admin can view any user, users can only view themselves)"""
     try:
-        from services.datastore_activity_service import datastore_activity_service
 
         # Determine which user to get summary for
         target_user_id = (
@@ -775,8 +998,9 @@ async def get_activity_summary(
         )
 
 
-@app.post("/activity-logs/cleanup")
-@limiter.limit(RATE_LIMIT_GENERAL)
+@app.post(
+    "/activity-logs/cleanup", dependencies=[Depends(rate_limit(RATE_LIMIT_GENERAL))]
+)
 async def cleanup_old_activity_logs(
     request: Request,
     days_to_keep: int = 90,
@@ -784,7 +1008,6 @@ async def cleanup_old_activity_logs(
 ):
     """Clean up old activity logs (Admin only)"""
     try:
-        from services.datastore_activity_service import datastore_activity_service
 
         # Validate days parameter
         if days_to_keep < 30:
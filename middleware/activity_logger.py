@@ -40,17 +40,17 @@ class ActivityLoggingMiddleware(BaseHTTPMiddleware):
         user_info = None
         try:
             auth_header = request.headers.get("Authorization")
-            logger.info(f"Authorization header: {auth_header}")
             if auth_header and auth_header.startswith("Bearer "):
                 token = auth_header.split(" ")[1]
-                logger.info(f"Token extracted: {token[:20]}...")
                 user_info = get_current_user_from_token(token)
                 if user_info:
-                    logger.info(f"User info extracted: {user_info}")
+                    # Share the decoded identity with auth dependencies
+                    request.state.user = user_info
+                    logger.debug("User info extracted: %s", user_info)
                 else:
-                    logger.warning("No user info found in token")
+                    logger.debug("No user info found in token")
             else:
-                logger.warning("No Authorization header found")
+                logger.debug("No Authorization header found")
         except Exception as e:
             logger.error(f"Error extracting user info: {str(e)}")
             # If no valid token, we'll log as anonymous
@@ -93,7 +93,7 @@ class ActivityLoggingMiddleware(BaseHTTPMiddleware):
             # Prepare metadata
             metadata = {
                 "request_id": getattr(request.state, "request_id", None),
-                "response_size": len(response.body) if hasattr(response, "body") else 0,
+                "response_size": int(response.headers.get("content-length", 0)),
                 "query_params": (
                     dict(request.query_params) if request.query_params else {}
                 ),
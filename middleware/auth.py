@@ -3,6 +3,8 @@ Authentication middleware for API endpoints.
 Supports API Key authentication via Bearer token.
 """
 
+import hmac
+
 from fastapi import Security, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from properties.config import Configuration
@@ -10,6 +12,12 @@ from properties.config import Configuration
 config = Configuration()
 security = HTTPBearer()
 
+# Encoded once so each request only encodes the presented token
+_API_SECRET_KEY_BYTES = (config.API_SECRET_KEY or "").encode()
+
+_UNAUTHORIZED_DETAIL = "Invalid authentication credentials"
+_UNAUTHORIZED_HEADERS = {"WWW-Authenticate": "Bearer"}
+
 
 async def verify_api_key(
     credentials: HTTPAuthorizationCredentials = Security(security),
@@ -35,11 +43,11 @@ async def verify_api_key(
             detail="API authentication not configured",
         )
 
-    if token != config.API_SECRET_KEY:
+    if not hmac.compare_digest(token.encode(), _API_SECRET_KEY_BYTES):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
+            detail=_UNAUTHORIZED_DETAIL,
+            headers=_UNAUTHORIZED_HEADERS,
         )
 
     return token
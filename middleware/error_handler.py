@@ -3,64 +3,57 @@ Global exception handler for standardized error responses.
 """
 
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError, HTTPException
-from slowapi.errors import RateLimitExceeded
+from middleware.rate_limiter import RateLimitExceeded
 from pydantic import ValidationError
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _error_body(code: str, message, details=None) -> dict:
+    """Build the standardized error response body."""
+    return {
+        "success": False,
+        "error": {"code": code, "message": message, "details": details},
+    }
+
+
+# Static body for 500s when error details are not exposed
+_INTERNAL_ERROR_BODY = _error_body("INTERNAL_ERROR", "An unexpected error occurred")
+_RATE_LIMIT_MESSAGE = "Too many requests. Please try again later."
+
+
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTPException with standardized format."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
-        content={
-            "success": False,
-            "error": {
-                "code": f"HTTP_{exc.status_code}",
-                "message": exc.detail,
-                "details": None,
-            },
-        },
+        content=_error_body(f"HTTP_{exc.status_code}", exc.detail),
+        headers=exc.headers,
     )
 
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors with standardized format."""
-    errors = {}
-    for error in exc.errors():
-        field = ".".join(str(x) for x in error["loc"])
-        errors[field] = error["msg"]
+    errors = {".".join(map(str, e["loc"])): e["msg"] for e in exc.errors()}
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content={
-            "success": False,
-            "error": {
-                "code": "VALIDATION_ERROR",
-                "message": "Request validation failed",
-                "details": errors,
-            },
-        },
+        content=_error_body("VALIDATION_ERROR", "Request validation failed", errors),
     )
 
 
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
     """Handle rate limit exceeded errors."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-        content={
-            "success": False,
-            "error": {
-                "code": "RATE_LIMIT_EXCEEDED",
-                "message": "Too many requests. Please try again later.",
-                "details": {
-                    "retry_after": exc.detail if hasattr(exc, "detail") else None
-                },
-            },
-        },
+        content=_error_body(
+            "RATE_LIMIT_EXCEEDED",
+            _RATE_LIMIT_MESSAGE,
+            {"retry_after": exc.retry_after},
+        ),
+        headers={"Retry-After": str(exc.retry_after)},
     )
 
 
@@ -68,16 +61,13 @@ async def generic_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions with standardized format."""
     logger.error(f"Unexpected error: {str(exc)}", exc_info=True)
 
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={
-            "success": False,
-            "error": {
-                "code": "INTERNAL_ERROR",
-                "message": "An unexpected error occurred",
-                "details": (
-                    {"error": str(exc)} if logger.level == logging.DEBUG else None
-                ),
-            },
-        },
+    if not logger.isEnabledFor(logging.DEBUG):
+        content = _INTERNAL_ERROR_BODY
+    else:
+        content = _error_body(
+            "INTERNAL_ERROR", "An unexpected error occurred", {"error": str(exc)}
+        )
+
+    return ORJSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=content
     )
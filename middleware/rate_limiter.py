@@ -1,23 +1,21 @@
 """
 Rate limiting middleware to prevent API abuse.
-Uses slowapi library with Redis backend.
+Sliding-window limiter evaluated atomically in Redis (one round trip per request).
 """
 
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from properties.config import Configuration
+import logging
+import math
+import secrets
+import time
 
-config = Configuration()
+from fastapi import Request
+from redis import asyncio as aioredis
+from properties.config import get_settings
 
-# Initialize rate limiter
-limiter = Limiter(
-    key_func=get_remote_address,
-    storage_uri=config.REDIS_URL,
-    strategy="fixed-window",
-)
+config = get_settings()
+logger = logging.getLogger(__name__)
 
-
-# Rate limit decorators for different endpoint types
+# Rate limit specs for different endpoint types
 # General API endpoints: 100 requests per minute
 RATE_LIMIT_GENERAL = "100/minute"
 
@@ -29,3 +27,138 @@ RATE_LIMIT_AI = "10/minute"
 
 # Queue status check: 200 requests per minute
 RATE_LIMIT_STATUS = "200/minute"
+
+# Connections shared by every limiter in this worker process
+REDIS_MAX_CONNECTIONS = 100
+
+_PERIOD_MS = {
+    "second": 1_000,
+    "minute": 60_000,
+    "hour": 3_600_000,
+    "day": 86_400_000,
+}
+
+# KEYS[1] = window key (sorted set of request timestamps)
+# ARGV = now_ms, window_ms, limit, cost, member prefix
+# Returns {allowed (0/1), retry_after_ms}
+_SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count + cost <= limit then
+    for i = 1, cost do
+        redis.call('ZADD', KEYS[1], now, ARGV[5] .. '-' .. i)
+    end
+    redis.call('PEXPIRE', KEYS[1], window)
+    return {1, 0}
+end
+if cost > limit then
+    return {0, window}
+end
+
+-- Wait until enough of the oldest entries have left the window
+local freeing = count + cost - limit - 1
+local entry = redis.call('ZRANGE', KEYS[1], freeing, freeing, 'WITHSCORES')
+return {0, tonumber(entry[2]) + window - now}
+"""
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a client has used up its window for the requested route."""
+
+    def __init__(self, limit: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded: {limit}")
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+def parse_rate(limit: str) -> tuple[int, int]:
+    """
+    Parse a rate spec such as "100/minute".
+
+    Returns:
+        tuple[int, int]: (limit, window in milliseconds)
+    """
+    count, _, period = limit.partition("/")
+    return int(count), _PERIOD_MS[period.strip().rstrip("s")]
+
+
+def get_remote_address(request: Request) -> str:
+    """Client IP used as the rate limit identity."""
+    return request.client.host if request.client else "127.0.0.1"
+
+
+class LuaSlidingWindowLimiter:
+    """
+    Sliding-window rate limiter backed by one Redis sorted set per key.
+
+    The script is loaded once (SCRIPT LOAD) and then run with EVALSHA, so each
+    check costs a single round trip. Keys expire with their window, so idle
+    clients do not accumulate in Redis.
+    """
+
+    def __init__(self, redis_url: str, max_connections: int = REDIS_MAX_CONNECTIONS):
+        pool = aioredis.BlockingConnectionPool.from_url(
+            redis_url, max_connections=max_connections
+        )
+        self.redis = aioredis.Redis(connection_pool=pool)
+        self._script = self.redis.register_script(_SLIDING_WINDOW_LUA)
+
+    async def hit(
+        self, key: str, limit: int, window_ms: int, cost: int = 1
+    ) -> tuple[bool, int]:
+        """
+        Record `cost` requests for `key` if they all fit in the window.
+
+        Returns:
+            tuple[bool, int]: (allowed, milliseconds until the next slot frees up)
+        """
+        now_ms = int(time.time() * 1000)
+        member = f"{now_ms}-{secrets.token_hex(4)}"
+        allowed, retry_after_ms = await self._script(
+            keys=[key], args=[now_ms, window_ms, limit, cost, member]
+        )
+        return bool(allowed), int(retry_after_ms)
+
+    async def check(self, request: Request, limit: str, cost: int = 1):
+        """
+        Charge `cost` requests against `limit` for this client and route.
+
+        Raises:
+            RateLimitExceeded: If the window has no room for all of them.
+        """
+        max_requests, window_ms = parse_rate(limit)
+        route = request.scope.get("route")
+        route_path = route.path if route is not None else request.url.path
+        key = f"ratelimit:{route_path}:{get_remote_address(request)}"
+        try:
+            allowed, retry_after_ms = await self.hit(key, max_requests, window_ms, cost)
+        except Exception as e:
+            # Fail open: an unavailable Redis must not take the API down
+            logger.warning(f"Rate limiter unavailable, allowing request: {e}")
+            return
+        if not allowed:
+            raise RateLimitExceeded(limit, math.ceil(retry_after_ms / 1000))
+
+    def rate_limit(self, limit: str):
+        """
+        Build a FastAPI dependency enforcing `limit` per client and route.
+
+        Usage:
+            @app.get("/path", dependencies=[Depends(rate_limit(RATE_LIMIT_GENERAL))])
+        """
+        parse_rate(limit)  # fail fast on a bad spec
+
+        async def dependency(request: Request):
+            await self.check(request, limit)
+
+        return dependency
+
+
+limiter = LuaSlidingWindowLimiter(config.REDIS_URL)
+rate_limit = limiter.rate_limit
+check_rate_limit = limiter.check
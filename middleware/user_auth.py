@@ -2,20 +2,26 @@
 User authentication middleware
 """
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from services.auth_service import get_current_user, verify_token
+from services.auth_service import get_current_user, get_user, verify_token
 from models.user import UserInDB
 
 security = HTTPBearer()
 
 
 async def get_current_active_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> UserInDB:
     """Get current active user from token"""
-    token = credentials.credentials
-    user = get_current_user(token)
+    # ActivityLoggingMiddleware already verified this request's token
+    user_info = getattr(request.state, "user", None)
+    user = get_user(user_info["username"]) if user_info else None
+    if user is None:
+        # jwt.decode is CPU-bound; keep it off the event loop
+        user = await run_in_threadpool(get_current_user, credentials.credentials)
     if user.disabled:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user"
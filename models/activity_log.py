@@ -3,7 +3,7 @@ User Activity Log Models
 """
 
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 from pydantic import BaseModel, Field
 from enum import Enum
 
@@ -48,6 +48,31 @@ class ActivityLog(BaseModel):
     )
 
 
+class ActivityLogSummary(BaseModel):
+    """Lightweight activity log row for list views (projection queries)"""
+
+    id: Optional[str] = None
+    user_id: Optional[str] = None
+    username: Optional[str] = None
+    activity_type: Optional[ActivityType] = None
+    endpoint: Optional[str] = None
+    method: Optional[str] = None
+    status_code: Optional[int] = None
+    ip_address: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    duration_ms: Optional[float] = None
+
+
+# Default projection for the activity log list view
+LIST_VIEW_FIELDS = [
+    "timestamp",
+    "username",
+    "activity_type",
+    "status_code",
+    "duration_ms",
+]
+
+
 class ActivityLogCreate(BaseModel):
     """Model for creating activity logs"""
 
@@ -74,13 +99,20 @@ class ActivityLogFilter(BaseModel):
     end_date: Optional[datetime] = None
     page: int = Field(default=1, ge=1)
     limit: int = Field(default=50, ge=1, le=1000)
+    cursor: Optional[str] = Field(
+        None, description="next_cursor from the previous page (replaces page)"
+    )
+    projection: Optional[List[str]] = Field(
+        None, description="Only return these fields (ActivityLogSummary rows)"
+    )
 
 
 class ActivityLogResponse(BaseModel):
     """Response model for activity logs"""
 
-    logs: list[ActivityLog]
+    logs: list[Union[ActivityLog, ActivityLogSummary]]
     total: int
     page: int
     limit: int
     total_pages: int
+    next_cursor: Optional[str] = None
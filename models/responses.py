@@ -16,6 +16,16 @@ class SuccessResponse(BaseModel, Generic[T]):
     data: Optional[T] = None
 
 
+def ok(message: str, data: Any = None) -> SuccessResponse:
+    """
+    Build a SuccessResponse without re-validating `data`.
+
+    Use for payloads that are already validated models (e.g. service results);
+    serialization still goes through the app's ORJSONResponse.
+    """
+    return SuccessResponse.model_construct(success=True, message=message, data=data)
+
+
 class ErrorDetail(BaseModel):
     """Error detail structure."""
 
@@ -1,45 +1,90 @@
 import os
+from functools import lru_cache
+from typing import Annotated, ClassVar, List, Optional
 from dotenv import load_dotenv
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, NoDecode
 
+# Must run before settings are read so .env values land in os.environ
 load_dotenv()
 
 
-class Configuration:
-    """Configuration class for managing environment variables and application settings."""
+class Settings(BaseSettings):
+    """Typed application settings, parsed and validated once from the environment."""
 
     # OpenAI Configuration
-    OPENAI_KEY = os.getenv("OPENAI_KEY")
-    OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")
-    OPENAI_TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.2"))
+    OPENAI_KEY: Optional[str] = None
+    OPENAI_MODEL: str = "gpt-4"
+    OPENAI_TEMPERATURE: float = 0.2
+    # Concurrent LLM calls allowed per process (API server or Celery worker)
+    OPENAI_MAX_CONCURRENCY: int = Field(8, ge=1)
 
     # Google Cloud Configuration
-    PROJECT_ID = os.getenv("PROJECT_ID")
-    LOCATION = os.getenv("LOCATION", "us")
-    PROCESSOR_ID = os.getenv("PROCESSOR_ID")
-    PROCESSOR_VERSION_ID = os.getenv("PROCESSOR_VERSION_ID")
-    GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-    FIRESTORE_DATABASE = os.getenv("FIRESTORE_DATABASE", "imageinformation")
+    PROJECT_ID: Optional[str] = None
+    LOCATION: str = "us"
+    PROCESSOR_ID: Optional[str] = None
+    PROCESSOR_VERSION_ID: Optional[str] = None
+    GOOGLE_APPLICATION_CREDENTIALS: Optional[str] = None
+    FIRESTORE_DATABASE: str = "imageinformation"
 
     # Application Configuration
-    BUCKET_NAME = os.getenv("BUCKET_NAME", "display-form-extract")
-    UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "temp_uploads")
+    BUCKET_NAME: str = "display-form-extract"
+    UPLOAD_FOLDER: str = "temp_uploads"
 
     # Security Configuration
-    ALLOWED_ORIGINS = os.getenv(
-        "ALLOWED_ORIGINS", "http://localhost:3000,https://localhost:3000"
-    ).split(",")
-    MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB default
-    ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
-    API_SECRET_KEY = os.getenv("API_SECRET_KEY")
+    ALLOWED_ORIGINS: Annotated[List[str], NoDecode] = [
+        "http://localhost:3000",
+        "https://localhost:3000",
+    ]
+    MAX_FILE_SIZE: int = 10_485_760  # 10MB default
+    ALLOWED_EXTENSIONS: ClassVar[set] = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+    # Also run libmagic (python-magic) on uploads, after the signature check
+    FILE_VALIDATION_USE_MAGIC: bool = False
+    API_SECRET_KEY: Optional[str] = None
+    # bcrypt cost factor for new hashes; lower it (e.g. 4) for local/test runs
+    BCRYPT_ROUNDS: int = Field(12, ge=4, le=31)
 
     # Redis/Celery Configuration
-    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-    CELERY_TIMEZONE = os.getenv("CELERY_TIMEZONE", "UTC")
-    CELERY_WORKER_CONCURRENCY = int(os.getenv("CELERY_WORKER_CONCURRENCY", "2"))
+    REDIS_URL: str = "redis://localhost:6379/0"
+    CELERY_TIMEZONE: str = "UTC"
+    CELERY_WORKER_CONCURRENCY: int = 2
+
+    # Activity log batching (Datastore allows 500 mutations per commit)
+    ACTIVITY_LOG_BATCH_SIZE: int = Field(50, ge=1, le=500)
+    ACTIVITY_LOG_WORKERS: int = Field(20, ge=1)
 
     # Collection Names
-    COLLECTION_NAME_IMAGE_DETAIL = "imagedetail"
-    COLLECTION_NAME_FORM_EXTRACT = "forminformation"
+    COLLECTION_NAME_IMAGE_DETAIL: ClassVar[str] = "imagedetail"
+    COLLECTION_NAME_FORM_EXTRACT: ClassVar[str] = "forminformation"
+
+    @field_validator("ALLOWED_ORIGINS", mode="before")
+    @classmethod
+    def _split_origins(cls, value):
+        # Comma-separated in the environment, e.g. "http://a,http://b"
+        return value.split(",") if isinstance(value, str) else value
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Return the process-wide Settings instance (parsed on first call)."""
+    return Settings()
+
+
+class _SettingsProxyMeta(type):
+    """Resolve class attribute access (Configuration.X) through get_settings()."""
+
+    def __getattr__(cls, name):
+        return getattr(get_settings(), name)
+
+
+class Configuration(metaclass=_SettingsProxyMeta):
+    """Configuration class for managing environment variables and application settings.
+
+    Kept for existing callers; values come from the cached Settings instance.
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_settings(), name)
 
     @classmethod
     def validate_required_config(cls):
@@ -1,3 +1,6 @@
+import textwrap
+from string import Template
+
 PROMPT_SAMPLES = {
     "ticket_information": {
         "system_prompt": """
@@ -58,7 +61,17 @@ PROMPT_SAMPLES = {
         "user_prompt": """
             Hãy trích xuất và chuẩn hóa thông tin theo đúng yêu cầu trên. 
 
-            {context}
+            $context
         """
     }
-}
\ No newline at end of file
+}
+
+
+# Rendered once at import: the system prompt has no placeholders, and the
+# user prompt only needs the OCR text substituted per request.
+TICKET_SYSTEM_PROMPT = textwrap.dedent(
+    PROMPT_SAMPLES["ticket_information"]["system_prompt"]
+)
+TICKET_USER_TEMPLATE = Template(
+    textwrap.dedent(PROMPT_SAMPLES["ticket_information"]["user_prompt"])
+)
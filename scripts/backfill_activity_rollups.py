@@ -0,0 +1,21 @@
+"""One-off backfill of the ActivityDailyRollup counters from existing logs.
+
+Usage (from the repository root):
+  python -m scripts.backfill_activity_rollups
+
+Activity summaries only read the daily rollups, so logs written before the
+rollups existed are not counted until this has run. Safe to re-run: each
+(user, day) counter is only topped up with logs it has not counted yet.
+"""
+import asyncio
+
+from services.datastore_activity_service import datastore_activity_service
+
+
+def main():
+    added = asyncio.run(datastore_activity_service.backfill_rollups())
+    print(f"Backfilled {added} activity logs into daily rollups")
+
+
+if __name__ == "__main__":
+    main()
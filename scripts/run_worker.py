@@ -7,6 +7,12 @@ Logic:
   - If CELERY_FORCE_SOLO=1 or Python >= 3.13 => use solo pool.
   - Else use prefork.
 Override explicitly with CELERY_POOL env var (prefork|solo|threads|gevent ...).
+
+Queues:
+  - CELERY_QUEUES picks the queues to consume (default "upload,extract").
+  - Workers consuming the extract queue prefetch one task at a time, so a
+    long LLM call never holds further tasks hostage; override with
+    CELERY_PREFETCH_MULTIPLIER.
 """
 import os
 import sys
@@ -19,6 +25,10 @@ def main():
   force_solo = os.getenv("CELERY_FORCE_SOLO") == "1" or py_ver >= (3, 13)
   pool = env_pool or ("solo" if force_solo else "prefork")
   concurrency = os.getenv("CELERY_CONCURRENCY")  # e.g. 4, 8
+  queues = os.getenv("CELERY_QUEUES", "upload,extract")
+  prefetch = os.getenv("CELERY_PREFETCH_MULTIPLIER") or (
+    "1" if "extract" in queues.split(",") else None
+  )
 
   cmd = [
     sys.executable,
@@ -31,12 +41,16 @@ def main():
     "info",
     "-P",
     pool,
+    "-Q",
+    queues,
   ]
+  if prefetch:
+    cmd.extend(["--prefetch-multiplier", prefetch])
   if concurrency and pool != "solo":
     cmd.extend(["-c", concurrency])
 
   print(
-    f"[run_worker] Python {py_ver}, pool={pool}, concurrency={concurrency or ('1(solo)' if pool=='solo' else 'default')}, command={' '.join(cmd)}"
+    f"[run_worker] Python {py_ver}, pool={pool}, queues={queues}, concurrency={concurrency or ('1(solo)' if pool=='solo' else 'default')}, command={' '.join(cmd)}"
   )
   try:
     subprocess.run(cmd, check=True)
@@ -0,0 +1,124 @@
+"""
+Batched, non-blocking Datastore writer for activity logs.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Set
+
+from google.api_core.exceptions import Conflict, ServiceUnavailable
+from google.api_core.retry import Retry, if_exception_type
+from google.cloud import datastore
+
+logger = logging.getLogger(__name__)
+
+# Datastore allows up to 500 mutations per commit
+MAX_BATCH_SIZE = 500
+FLUSH_INTERVAL_SECONDS = 0.025
+
+# Contended transactions fail with Aborted (a Conflict subclass) and a
+# transient outage with ServiceUnavailable; retry both. DeadlineExceeded is
+# left alone: the commit may have applied, and replaying it would double-count
+# the rollups.
+_CONFLICT_RETRY = Retry(predicate=if_exception_type(Conflict, ServiceUnavailable))
+
+
+class AsyncBatcher:
+    """
+    Accumulate entities and write them in transactional put_multi batches.
+
+    A batch is sent once `batch_size` entities are queued or
+    FLUSH_INTERVAL_SECONDS have passed since its first entity. Up to
+    `workers` batches are committed concurrently on a thread pool, since the
+    Datastore client is synchronous.
+
+    `on_commit`, if given, is called inside each batch's transaction and
+    returns extra entities (e.g. counters) to write atomically with it.
+    """
+
+    def __init__(
+        self,
+        client: datastore.Client,
+        batch_size: int,
+        workers: int,
+        on_commit: Optional[
+            Callable[[List[datastore.Entity]], List[datastore.Entity]]
+        ] = None,
+    ):
+        self.client = client
+        self.on_commit = on_commit
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.workers = max(1, workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="activity-log-writer"
+        )
+        self._queue: Optional[asyncio.Queue] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending: Set[asyncio.Task] = set()
+
+    def start(self):
+        """Start the background flush loop on the running event loop"""
+        if self._flush_task is None or self._flush_task.done():
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.workers)
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def shutdown(self):
+        """Flush queued entities and wait for in-flight commits"""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._queue.put_nowait(None)
+            await self._flush_task
+        self._flush_task = None
+        if self._pending:
+            await asyncio.gather(*self._pending)
+
+    def put(self, entity: datastore.Entity):
+        """Queue an entity for the next batch"""
+        self.start()
+        self._queue.put_nowait(entity)
+
+    async def _flush_loop(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            entity = await self._queue.get()
+            if entity is None:
+                break
+            entities = [entity]
+            deadline = loop.time() + FLUSH_INTERVAL_SECONDS
+            while len(entities) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entity = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entity is None:
+                    stopping = True
+                    break
+                entities.append(entity)
+
+            # Wait for a free worker, then commit without blocking the loop
+            await self._slots.acquire()
+            task = asyncio.create_task(self._commit(entities))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _commit(self, entities: List[datastore.Entity]):
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, self._write, entities)
+        except Exception as e:
+            logger.error(f"Failed to write {len(entities)} activity logs: {str(e)}")
+        finally:
+            self._slots.release()
+
+    @_CONFLICT_RETRY
+    def _write(self, entities: List[datastore.Entity]):
+        """Write one batch in a single transaction (retried on conflict)"""
+        with self.client.transaction():
+            extra = self.on_commit(entities) if self.on_commit else []
+            self.client.put_multi(entities + extra)
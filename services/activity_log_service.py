@@ -2,21 +2,95 @@
 User Activity Logging Service
 """
 
+import asyncio
+import base64
+import json
 import uuid
+from collections import Counter
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
+from fastapi.concurrency import run_in_threadpool
 from google.cloud import firestore
+from google.cloud.firestore_v1.field_path import FieldPath
 from models.activity_log import (
     ActivityLog,
     ActivityLogCreate,
     ActivityLogFilter,
     ActivityLogResponse,
+    ActivityType,
 )
 from properties.config import Configuration
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Firestore batch limit is 500
+FLUSH_BATCH_SIZE = 500
+FLUSH_INTERVAL_SECONDS = 1.0
+
+# Stored string value for each activity type
+_ACTIVITY_VALUES = {a: a.value for a in ActivityType}
+
+# (filter attribute, document field, operator) applied by get_logs
+_LOG_FILTERS = (
+    ("user_id", "user_id", "=="),
+    ("username", "username", "=="),
+    ("activity_type", "activity_type", "=="),
+    ("start_date", "timestamp", ">="),
+    ("end_date", "timestamp", "<="),
+)
+
+
+def _apply_filters(query, filters: ActivityLogFilter):
+    """Add a where clause for every filter that is set"""
+    for attr, field, op in _LOG_FILTERS:
+        value = getattr(filters, attr)
+        if value:
+            if attr == "activity_type":
+                value = _ACTIVITY_VALUES[value]
+            query = query.where(field, op, value)
+    return query
+
+
+@dataclass(slots=True)
+class _ActivityRecord:
+    """Queued log entry; only converted to a Firestore dict at flush time"""
+
+    id: str
+    timestamp: datetime
+    user_id: str
+    username: str
+    activity_type: str
+    description: str
+    endpoint: Optional[str] = None
+    method: Optional[str] = None
+    status_code: Optional[int] = None
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    duration_ms: Optional[float] = None
+
+
+def _record_to_doc(record: _ActivityRecord) -> Dict[str, Any]:
+    """Firestore document for a record, leaving out unset fields"""
+    return {k: v for k, v in asdict(record).items() if v is not None}
+
+
+def _encode_cursor(timestamp: datetime, log_id: str) -> str:
+    """Opaque cursor pointing just past the given log"""
+    raw = json.dumps({"ts": timestamp.isoformat(), "id": log_id})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Inverse of _encode_cursor"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(data["ts"]), data["id"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid pagination cursor") from None
+
 
 class ActivityLogService:
     """Service for managing user activity logs"""
@@ -25,38 +99,88 @@ class ActivityLogService:
         """Initialize the activity log service"""
         self.db = firestore.Client()
         self.collection_name = "activity_logs"
+        self._coll = self.db.collection(self.collection_name)
+        self._queue: Optional[asyncio.Queue] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background flush loop on the running event loop"""
+        if self._flush_task is None or self._flush_task.done():
+            self._queue = asyncio.Queue()
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def shutdown(self):
+        """Flush queued logs and stop the background flush loop"""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._queue.put_nowait(None)
+            await self._flush_task
+        self._flush_task = None
+
+    async def _flush_loop(self):
+        """Write queued logs in batches of up to FLUSH_BATCH_SIZE per second"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            items = [item]
+            deadline = loop.time() + FLUSH_INTERVAL_SECONDS
+            while len(items) < FLUSH_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                items.append(item)
+            await self._commit(items)
+
+    async def _commit(self, items: List[_ActivityRecord]):
+        """Commit one batch of queued records"""
+        document = self._coll.document
+        batch = self.db.batch()
+        for record in items:
+            batch.set(document(record.id), _record_to_doc(record))
+        try:
+            await run_in_threadpool(batch.commit)
+        except Exception as e:
+            logger.error(f"Failed to write {len(items)} activity logs: {str(e)}")
 
     async def create_log(self, log_data: ActivityLogCreate) -> ActivityLog:
         """Create a new activity log entry"""
         try:
-            # Generate unique ID
-            log_id = str(uuid.uuid4())
-
-            # Create log document
-            log_doc = ActivityLog(
-                id=log_id,
+            # Plain record from the already-validated input (no model rebuild)
+            record = _ActivityRecord(
+                id=uuid.uuid4().hex,
+                timestamp=datetime.utcnow(),
                 user_id=log_data.user_id,
                 username=log_data.username,
-                activity_type=log_data.activity_type,
+                activity_type=_ACTIVITY_VALUES[log_data.activity_type],
                 description=log_data.description,
                 endpoint=log_data.endpoint,
                 method=log_data.method,
                 status_code=log_data.status_code,
                 ip_address=log_data.ip_address,
                 user_agent=log_data.user_agent,
-                metadata=log_data.metadata or {},
-                timestamp=datetime.utcnow(),
+                metadata=log_data.metadata,
                 duration_ms=log_data.duration_ms,
             )
 
-            # Save to Firestore
-            doc_ref = self.db.collection(self.collection_name).document(log_id)
-            doc_ref.set(log_doc.dict())
+            # Queue for the next batched Firestore write
+            self.start()
+            self._queue.put_nowait(record)
 
-            logger.info(
-                f"Activity log created: {log_data.activity_type} by {log_data.username}"
+            logger.debug(
+                "Activity log queued: %s by %s",
+                log_data.activity_type,
+                log_data.username,
             )
-            return log_doc
+            return ActivityLog.model_construct(**_record_to_doc(record))
 
         except Exception as e:
             logger.error(f"Failed to create activity log: {str(e)}")
@@ -65,31 +189,28 @@ class ActivityLogService:
     async def get_logs(self, filters: ActivityLogFilter) -> ActivityLogResponse:
         """Get activity logs with filtering and pagination"""
         try:
-            # Build query
-            query = self.db.collection(self.collection_name)
-
-            # Apply filters
-            if filters.user_id:
-                query = query.where("user_id", "==", filters.user_id)
-            if filters.username:
-                query = query.where("username", "==", filters.username)
-            if filters.activity_type:
-                query = query.where("activity_type", "==", filters.activity_type.value)
-            if filters.start_date:
-                query = query.where("timestamp", ">=", filters.start_date)
-            if filters.end_date:
-                query = query.where("timestamp", "<=", filters.end_date)
-
-            # Order by timestamp (newest first)
-            query = query.order_by("timestamp", direction=firestore.Query.DESCENDING)
-
-            # Get total count
-            total_docs = query.stream()
-            total_count = sum(1 for _ in total_docs)
-
-            # Apply pagination
-            offset = (filters.page - 1) * filters.limit
-            query = query.offset(offset).limit(filters.limit)
+            # Build query with filters
+            base_query = _apply_filters(self._coll, filters)
+
+            # Get total count with a server-side aggregation (no documents sent)
+            count_result = base_query.count().get()
+            total_count = count_result[0][0].value
+
+            # Order by timestamp (newest first), document id as tie-breaker
+            query = base_query.order_by(
+                "timestamp", direction=firestore.Query.DESCENDING
+            ).order_by("__name__", direction=firestore.Query.DESCENDING)
+
+            # A cursor resumes after the last log of the previous page, so the
+            # server doesn't read and discard every earlier document
+            if filters.cursor:
+                timestamp, log_id = _decode_cursor(filters.cursor)
+                query = query.start_after(
+                    {"timestamp": timestamp, "__name__": self._coll.document(log_id)}
+                )
+            else:
+                query = query.offset((filters.page - 1) * filters.limit)
+            query = query.limit(filters.limit)
 
             # Execute query
             docs = query.stream()
@@ -104,12 +225,17 @@ class ActivityLogService:
             # Calculate total pages
             total_pages = (total_count + filters.limit - 1) // filters.limit
 
+            next_cursor = None
+            if len(logs) == filters.limit:
+                next_cursor = _encode_cursor(logs[-1].timestamp, logs[-1].id)
+
             return ActivityLogResponse(
                 logs=logs,
                 total=total_count,
                 page=filters.page,
                 limit=filters.limit,
                 total_pages=total_pages,
+                next_cursor=next_cursor,
             )
 
         except Exception as e:
@@ -126,49 +252,35 @@ class ActivityLogService:
 
             # Query logs for the user in the date range
             query = (
-                self.db.collection(self.collection_name)
-                .where("user_id", "==", user_id)
+                self._coll.where("user_id", "==", user_id)
                 .where("timestamp", ">=", start_date)
                 .where("timestamp", "<=", end_date)
+                # Only the fields the summary reads are sent back
+                .select(["activity_type", "timestamp"])
             )
 
             docs = query.stream()
 
-            # Process logs
-            activity_counts = {}
-            daily_activity = {}
-            error_count = 0
+            # Count by activity type and by day
+            activity_counts = Counter()
+            daily_activity = Counter()
 
             for doc in docs:
                 log_data = doc.to_dict()
-                activity_type = log_data.get("activity_type", "unknown")
+                activity_counts[log_data.get("activity_type", "unknown")] += 1
                 timestamp = log_data.get("timestamp")
-
-                # Count by activity type
-                activity_counts[activity_type] = (
-                    activity_counts.get(activity_type, 0) + 1
-                )
-
-                # Count by day
                 if timestamp:
-                    day = timestamp.strftime("%Y-%m-%d")
-                    daily_activity[day] = daily_activity.get(day, 0) + 1
-
-                # Count errors
-                if activity_type == "error":
-                    error_count += 1
+                    daily_activity[timestamp.date().isoformat()] += 1
 
             return {
                 "user_id": user_id,
                 "period_days": days,
-                "total_activities": sum(activity_counts.values()),
-                "activity_counts": activity_counts,
-                "daily_activity": daily_activity,
-                "error_count": error_count,
+                "total_activities": activity_counts.total(),
+                "activity_counts": dict(activity_counts),
+                "daily_activity": dict(daily_activity),
+                "error_count": activity_counts[ActivityType.ERROR.value],
                 "most_active_day": (
-                    max(daily_activity.items(), key=lambda x: x[1])[0]
-                    if daily_activity
-                    else None
+                    daily_activity.most_common(1)[0][0] if daily_activity else None
                 ),
             }
 
@@ -182,8 +294,9 @@ class ActivityLogService:
             cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
 
             # Query old logs
-            query = self.db.collection(self.collection_name).where(
-                "timestamp", "<", cutoff_date
+            # Fetch references only; deleting needs no field data
+            query = self._coll.where("timestamp", "<", cutoff_date).select(
+                [FieldPath.document_id()]
             )
 
             docs = query.stream()
@@ -2,11 +2,18 @@
 Authentication service
 """
 
+import functools
+import hashlib
+import math
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 import bcrypt
-from jose import JWTError, jwt
+import jwt
+from cachetools import TTLCache
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from models.user import UserInDB, TokenData
 from properties.config import Configuration
 import logging
@@ -17,6 +24,22 @@ logger = logging.getLogger(__name__)
 SECRET_KEY = Configuration.API_SECRET_KEY or "your-secret-key-for-jwt"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+BCRYPT_ROUNDS = Configuration.BCRYPT_ROUNDS
+
+AUTHENTICATE_HEADERS = {"WWW-Authenticate": "Bearer"}
+
+# Decoder with key, algorithm and required claims bound once
+_decode_token = functools.partial(
+    jwt.decode,
+    key=SECRET_KEY,
+    algorithms=[ALGORITHM],
+    options={"require": ["exp", "sub"]},
+)
+
+# Short-lived cache for the auth hot path. Tokens are keyed by a digest so
+# raw tokens are never held in memory longer than the request.
+_token_cache = TTLCache(maxsize=10000, ttl=30)
+_cache_lock = threading.Lock()
 
 
 # Mock user database (in production, use real database)
@@ -68,9 +91,14 @@ fake_users_db = {
     },
 }
 
+# Validated user models, built once instead of on every lookup
+_USERS_BY_NAME = {
+    username: UserInDB(**user) for username, user in fake_users_db.items()
+}
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash"""
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash (bcrypt runs in the threadpool)"""
     # Convert password to bytes, bcrypt handles up to 72 bytes
     password_bytes = plain_password.encode("utf-8")
     hashed_bytes = (
@@ -78,32 +106,29 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         if isinstance(hashed_password, str)
         else hashed_password
     )
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+    return await run_in_threadpool(bcrypt.checkpw, password_bytes, hashed_bytes)
 
 
-def get_password_hash(password: str) -> str:
-    """Hash a password"""
+async def get_password_hash(password: str) -> str:
+    """Hash a password (bcrypt runs in the threadpool)"""
     # Convert password to bytes and hash
     password_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    hashed = await run_in_threadpool(bcrypt.hashpw, password_bytes, salt)
     return hashed.decode("utf-8")
 
 
 def get_user(username: str) -> Optional[UserInDB]:
     """Get user from database"""
-    if username in fake_users_db:
-        user_dict = fake_users_db[username]
-        return UserInDB(**user_dict)
-    return None
+    return _USERS_BY_NAME.get(username)
 
 
-def authenticate_user(username: str, password: str) -> Optional[UserInDB]:
+async def authenticate_user(username: str, password: str) -> Optional[UserInDB]:
     """Authenticate a user"""
     user = get_user(username)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password(password, user.hashed_password):
         return None
     return user
 
@@ -120,21 +145,37 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def verify_token(token: str) -> TokenData:
-    """Verify a JWT token"""
-    credentials_exception = HTTPException(
+def _credentials_error() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
+        headers=AUTHENTICATE_HEADERS,
     )
+
+
+def verify_token(token: str) -> TokenData:
+    """Verify a JWT token"""
+    try:
+        # JWTs are base64url text; a non-ASCII token can never verify
+        cache_key = hashlib.blake2b(token.encode("ascii"), digest_size=16).digest()
+    except UnicodeEncodeError:
+        raise _credentials_error() from None
+    with _cache_lock:
+        cached = _token_cache.get(cache_key)
+    # Never serve a cached result past the token's own expiry
+    if cached is not None and cached[1] > time.time():
+        return cached[0]
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_token(token)
         username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        token_data = TokenData(username=username)
-    except JWTError:
-        raise credentials_exception
+    except jwt.InvalidTokenError:
+        username = None
+    if username is None:
+        raise _credentials_error()
+    token_data = TokenData(username=username)
+    with _cache_lock:
+        _token_cache[cache_key] = (token_data, payload.get("exp", math.inf))
     return token_data
 
 
@@ -146,7 +187,7 @@ def get_current_user(token: str) -> UserInDB:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
+            headers=AUTHENTICATE_HEADERS,
         )
     return user
 
@@ -154,9 +195,8 @@ def get_current_user(token: str) -> UserInDB:
 def get_current_user_from_token(token: str) -> dict:
     """Get user info from JWT token (for middleware use)"""
     try:
-        logger.info(f"Verifying token: {token[:20]}...")
         token_data = verify_token(token)
-        logger.info(f"Token data: {token_data}")
+        logger.debug("Token data: %s", token_data)
         user = get_user(username=token_data.username)
         if user is None:
             logger.warning(f"User not found: {token_data.username}")
@@ -166,7 +206,7 @@ def get_current_user_from_token(token: str) -> dict:
             "username": user.username,
             "role": user.role,
         }
-        logger.info(f"User info: {result}")
+        logger.debug("User info: %s", result)
         return result
     except Exception as e:
         logger.error(f"Error in get_current_user_from_token: {str(e)}")
@@ -177,3 +217,4 @@ def update_last_login(username: str):
     """Update user's last login time"""
     if username in fake_users_db:
         fake_users_db[username]["last_login"] = datetime.now()
+        _USERS_BY_NAME[username] = UserInDB(**fake_users_db[username])
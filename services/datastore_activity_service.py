@@ -3,28 +3,124 @@ Datastore Activity Logging Service
 Compatible with both Firestore Native Mode and Datastore Mode
 """
 
+import asyncio
+import base64
+import binascii
+import random
 import uuid
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from itertools import chain, islice
+from typing import List, Dict, Any
+from google.api_core import exceptions as gcp_exceptions
+from google.api_core.retry import Retry, if_exception_type
 from google.cloud import datastore
+from database.datastore_client import client as datastore_client
+from properties.config import get_settings
+from services.activity_log_batch import MAX_BATCH_SIZE, AsyncBatcher
 from models.activity_log import (
     ActivityLog,
     ActivityLogCreate,
     ActivityLogFilter,
     ActivityLogResponse,
+    ActivityLogSummary,
+    ActivityType,
 )
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Cleanup: Datastore allows up to 500 mutations per commit
+CLEANUP_BATCH_SIZE = 500
+CLEANUP_WORKERS = 20
+
+# Per-user daily counters, sharded so concurrent batches rarely contend
+ROLLUP_KIND = "ActivityDailyRollup"
+ROLLUP_SHARDS = 10
+
+# Datastore Lookup accepts at most 1000 keys per request
+LOOKUP_MAX_KEYS = 1000
+
+_COMMIT_RETRY = Retry(
+    predicate=if_exception_type(
+        gcp_exceptions.Aborted,
+        gcp_exceptions.DeadlineExceeded,
+        gcp_exceptions.InternalServerError,
+        gcp_exceptions.ServiceUnavailable,
+    )
+)
+
 
 class DatastoreActivityService:
     """Service for managing user activity logs using Cloud Datastore"""
 
     def __init__(self):
         """Initialize the activity log service"""
-        self.client = datastore.Client()
+        self.client = datastore_client
         self.kind = "ActivityLog"
+        settings = get_settings()
+        # Each log can add one rollup shard to its commit, so leave room
+        # for those within the 500-mutation limit
+        self._batcher = AsyncBatcher(
+            self.client,
+            batch_size=min(settings.ACTIVITY_LOG_BATCH_SIZE, MAX_BATCH_SIZE // 2),
+            workers=settings.ACTIVITY_LOG_WORKERS,
+            on_commit=self._apply_rollups,
+        )
+
+    def start(self):
+        """Start the background log writer on the running event loop"""
+        self._batcher.start()
+
+    async def shutdown(self):
+        """Flush queued logs and stop the background log writer"""
+        await self._batcher.shutdown()
+
+    def _rollup_key(self, user_id: str, day: str, shard: int) -> datastore.Key:
+        return self.client.key(ROLLUP_KIND, f"{user_id}:{day}:{shard}")
+
+    def _apply_rollups(
+        self, entities: List[datastore.Entity]
+    ) -> List[datastore.Entity]:
+        """
+        Add a batch of logs to the ActivityDailyRollup counters.
+
+        Runs inside the batch's commit transaction, so the counters stay in
+        step with the logs; each (user, day) pair in the batch updates one
+        randomly chosen shard.
+        """
+        deltas: Dict[tuple, Counter] = {}
+        for entity in entities:
+            pair = (entity["user_id"], entity["day_bucket"])
+            deltas.setdefault(pair, Counter())[
+                ActivityType(entity["activity_type"]).value
+            ] += 1
+
+        keys = [
+            self._rollup_key(user_id, day, random.randrange(ROLLUP_SHARDS))
+            for user_id, day in deltas
+        ]
+        existing = {rollup.key.name: rollup for rollup in self.client.get_multi(keys)}
+
+        rollups = []
+        for key, ((user_id, day), delta) in zip(keys, deltas.items()):
+            rollup = existing.get(key.name) or datastore.Entity(
+                key=key, exclude_from_indexes=("by_type",)
+            )
+            by_type = dict(rollup.get("by_type") or {})
+            for activity_type, count in delta.items():
+                by_type[activity_type] = by_type.get(activity_type, 0) + count
+            rollup.update(
+                {
+                    "user_id": user_id,
+                    "day_bucket": day,
+                    "total": rollup.get("total", 0) + sum(delta.values()),
+                    "errors": rollup.get("errors", 0) + delta[ActivityType.ERROR.value],
+                    "by_type": by_type,
+                }
+            )
+            rollups.append(rollup)
+        return rollups
 
     async def create_log(self, log_data: ActivityLogCreate) -> ActivityLog:
         """Create a new activity log entry"""
@@ -56,15 +152,20 @@ class DatastoreActivityService:
             # Convert to dict and handle datetime serialization
             log_dict = log_doc.dict()
             log_dict["timestamp"] = log_doc.timestamp  # Keep as datetime for Datastore
+            # Indexed day bucket so summaries count per day without date math
+            log_dict["day_bucket"] = log_doc.timestamp.date().isoformat()
 
             # Set entity properties
             entity.update(log_dict)
 
-            # Save to Datastore
-            self.client.put(entity)
+            # Queue for the next batched Datastore write; the key is the
+            # log's UUID, so a retried write is idempotent
+            self._batcher.put(entity)
 
-            logger.info(
-                f"Activity log created: {log_data.activity_type} by {log_data.username}"
+            logger.debug(
+                "Activity log queued: %s by %s",
+                log_data.activity_type,
+                log_data.username,
             )
             return log_doc
 
@@ -90,26 +191,68 @@ class DatastoreActivityService:
             if filters.end_date:
                 query.add_filter("timestamp", "<=", filters.end_date)
 
+            # Get total count with a server-side aggregation (no entities sent)
+            count_query = self.client.aggregation_query(query).count()
+            total_count = list(count_query.fetch())[0][0].value
+
             # Order by timestamp (newest first)
             query.order = ["-timestamp"]
 
-            # Get total count (approximate)
-            total_count = len(list(query.fetch()))
-
-            # Apply pagination
-            offset = (filters.page - 1) * filters.limit
-            query.offset = offset
-            query.limit = filters.limit
-
-            # Execute query
-            entities = list(query.fetch())
-
-            # Convert to ActivityLog objects
+            # Projection: Datastore rejects projecting a property that has an
+            # equality filter, so those come from the filter values instead
+            fixed_fields = {}
+            if filters.projection:
+                equality_values = {
+                    "user_id": filters.user_id,
+                    "username": filters.username,
+                    "activity_type": filters.activity_type,
+                }
+                fixed_fields = {
+                    name: value
+                    for name, value in equality_values.items()
+                    if value and name in filters.projection
+                }
+                # The sort property must be part of the projection
+                query.projection = ["timestamp"] + [
+                    name
+                    for name in filters.projection
+                    if name != "timestamp" and name not in fixed_fields
+                ]
+
+            # Apply pagination (offset/limit are fetch() arguments, not query
+            # attributes) and stream the page instead of materialising it.
+            # A cursor resumes where the previous page ended; page/offset is
+            # kept for clients without one, but the server scans and discards
+            # every skipped entity
+            if filters.cursor:
+                try:
+                    base64.urlsafe_b64decode(filters.cursor)
+                except (binascii.Error, ValueError):
+                    raise ValueError("Invalid pagination cursor") from None
+                entities = query.fetch(limit=filters.limit, start_cursor=filters.cursor)
+            else:
+                offset = (filters.page - 1) * filters.limit
+                entities = query.fetch(limit=filters.limit, offset=offset)
+
+            # Convert to ActivityLog (or ActivityLogSummary) objects. Entities
+            # were validated on write, so skip re-validation and only restore
+            # the enum that Datastore stores as a plain string
+            model = ActivityLogSummary if filters.projection else ActivityLog
             logs = []
             for entity in entities:
                 log_data = dict(entity)
+                log_data.update(fixed_fields)
                 log_data["id"] = entity.key.id_or_name
-                logs.append(ActivityLog(**log_data))
+                if log_data.get("activity_type") is not None:
+                    log_data["activity_type"] = ActivityType(log_data["activity_type"])
+                logs.append(model.model_construct(**log_data))
+
+            # Set once the page is consumed; None when there are no more results
+            next_cursor = (
+                entities.next_page_token.decode("ascii")
+                if entities.next_page_token
+                else None
+            )
 
             # Calculate total pages
             total_pages = (total_count + filters.limit - 1) // filters.limit
@@ -120,8 +263,13 @@ class DatastoreActivityService:
                 page=filters.page,
                 limit=filters.limit,
                 total_pages=total_pages,
+                next_cursor=next_cursor,
             )
 
+        except gcp_exceptions.InvalidArgument:
+            if filters.cursor:
+                raise ValueError("Invalid pagination cursor") from None
+            raise
         except Exception as e:
             logger.error(f"Failed to get activity logs: {str(e)}")
             raise
@@ -134,37 +282,43 @@ class DatastoreActivityService:
             end_date = datetime.utcnow()
             start_date = end_date - timedelta(days=days)
 
-            # Query logs for the user in the date range
-            query = self.client.query(kind=self.kind)
-            query.add_filter("user_id", "=", user_id)
-            query.add_filter("timestamp", ">=", start_date)
-            query.add_filter("timestamp", "<=", end_date)
-
-            entities = list(query.fetch())
-
-            # Process logs
-            activity_counts = {}
-            daily_activity = {}
-            error_count = 0
-
-            for entity in entities:
-                log_data = dict(entity)
-                activity_type = log_data.get("activity_type", "unknown")
-                timestamp = log_data.get("timestamp")
-
-                # Count by activity type
-                activity_counts[activity_type] = (
-                    activity_counts.get(activity_type, 0) + 1
+            # Point reads of the precomputed daily rollup shards instead of
+            # aggregating over raw logs
+            days_list = [
+                (start_date + timedelta(days=offset)).date().isoformat()
+                for offset in range((end_date.date() - start_date.date()).days + 1)
+            ]
+            keys = [
+                self._rollup_key(user_id, day, shard)
+                for day in days_list
+                for shard in range(ROLLUP_SHARDS)
+            ]
+            lookups = await asyncio.gather(
+                *(
+                    asyncio.to_thread(
+                        self.client.get_multi, keys[i : i + LOOKUP_MAX_KEYS]
+                    )
+                    for i in range(0, len(keys), LOOKUP_MAX_KEYS)
                 )
+            )
+            rollups = chain.from_iterable(lookups)
 
-                # Count by day
-                if timestamp:
-                    day = timestamp.strftime("%Y-%m-%d")
-                    daily_activity[day] = daily_activity.get(day, 0) + 1
-
-                # Count errors
-                if activity_type == "error":
-                    error_count += 1
+            type_totals = Counter()
+            day_totals = Counter()
+            error_count = 0
+            for rollup in rollups:
+                type_totals.update(rollup.get("by_type") or {})
+                day_totals[rollup["day_bucket"]] += rollup.get("total", 0)
+                error_count += rollup.get("errors", 0)
+
+            activity_counts = {
+                activity_type.value: type_totals[activity_type.value]
+                for activity_type in ActivityType
+                if type_totals[activity_type.value]
+            }
+            daily_activity = {
+                day: day_totals[day] for day in days_list if day_totals[day]
+            }
 
             return {
                 "user_id": user_id,
@@ -184,38 +338,142 @@ class DatastoreActivityService:
             logger.error(f"Failed to get user activity summary: {str(e)}")
             raise
 
-    async def cleanup_old_logs(self, days_to_keep: int = 90) -> int:
-        """Clean up activity logs older than specified days"""
+    @_COMMIT_RETRY
+    def _reconcile_rollup(self, user_id: str, day: str, counts: Counter) -> int:
+        """
+        Top up one (user, day) rollup with logs its shards have not counted.
+
+        Only the per-type shortfall against `counts` is added (to shard 0), so
+        re-running or retrying never double-counts.
+        """
+        keys = [self._rollup_key(user_id, day, shard) for shard in range(ROLLUP_SHARDS)]
+        with self.client.transaction():
+            shards = self.client.get_multi(keys)
+            counted = Counter()
+            for shard in shards:
+                counted.update(shard.get("by_type") or {})
+            missing = counts - counted
+            if not missing:
+                return 0
+
+            rollup = next(
+                (shard for shard in shards if shard.key.name == keys[0].name), None
+            ) or datastore.Entity(key=keys[0], exclude_from_indexes=("by_type",))
+            by_type = dict(rollup.get("by_type") or {})
+            for activity_type, count in missing.items():
+                by_type[activity_type] = by_type.get(activity_type, 0) + count
+            rollup.update(
+                {
+                    "user_id": user_id,
+                    "day_bucket": day,
+                    "total": rollup.get("total", 0) + sum(missing.values()),
+                    "errors": rollup.get("errors", 0)
+                    + missing[ActivityType.ERROR.value],
+                    "by_type": by_type,
+                }
+            )
+            self.client.put(rollup)
+            return sum(missing.values())
+
+    async def backfill_rollups(self) -> int:
+        """
+        Build ActivityDailyRollup counters from the raw logs, for history
+        written before the rollups existed. Safe to re-run.
+
+        Returns:
+            int: Number of logs added to the counters.
+        """
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
 
-            # Query old logs
-            query = self.client.query(kind=self.kind)
-            query.add_filter("timestamp", "<", cutoff_date)
+            def scan() -> Dict[tuple, Counter]:
+                counts: Dict[tuple, Counter] = {}
+                for entity in self.client.query(kind=self.kind).fetch():
+                    timestamp = entity.get("timestamp")
+                    day = entity.get("day_bucket") or (
+                        timestamp.date().isoformat() if timestamp else None
+                    )
+                    if not entity.get("user_id") or not day:
+                        continue
+                    counts.setdefault((entity["user_id"], day), Counter())[
+                        entity.get("activity_type", "unknown")
+                    ] += 1
+                return counts
+
+            counts = await asyncio.to_thread(scan)
+            slots = asyncio.Semaphore(CLEANUP_WORKERS)
+
+            async def reconcile(pair: tuple, pair_counts: Counter) -> int:
+                async with slots:
+                    return await asyncio.to_thread(
+                        self._reconcile_rollup, *pair, pair_counts
+                    )
+
+            added = sum(
+                await asyncio.gather(
+                    *(reconcile(pair, c) for pair, c in counts.items())
+                )
+            )
+            logger.info(f"Backfilled {added} activity logs into daily rollups")
+            return added
 
-            entities = list(query.fetch())
+        except Exception as e:
+            logger.error(f"Failed to backfill activity rollups: {str(e)}")
+            raise
 
-            # Delete old logs in batches
-            deleted_count = 0
-            batch = self.client.batch()
-            batch_count = 0
+    @_COMMIT_RETRY
+    def _delete_batch(self, keys: List[datastore.Key]) -> int:
+        """Delete one batch of keys in a single commit"""
+        batch = self.client.batch()
+        batch.begin()
+        for key in keys:
+            batch.delete(key)
+        batch.commit()
+        return len(keys)
+
+    async def _delete_matching(self, query: datastore.Query) -> int:
+        """Delete every entity a query matches; returns the number deleted"""
+        # Keys only; entity bodies aren't needed
+        query.keys_only()
+        keys = (entity.key for entity in query.fetch())
+
+        def next_batch() -> List[datastore.Key]:
+            return list(islice(keys, CLEANUP_BATCH_SIZE))
+
+        # Delete in batches of 500 (Datastore limit). Up to CLEANUP_WORKERS
+        # commits stay in flight while the next batch of keys is fetched,
+        # and the blocking RPCs run off the event loop
+        slots = asyncio.Semaphore(CLEANUP_WORKERS)
+
+        async def delete(batch_keys: List[datastore.Key]) -> int:
+            try:
+                return await asyncio.to_thread(self._delete_batch, batch_keys)
+            finally:
+                slots.release()
+
+        tasks = []
+        while batch_keys := await asyncio.to_thread(next_batch):
+            await slots.acquire()
+            tasks.append(asyncio.create_task(delete(batch_keys)))
+        return sum(await asyncio.gather(*tasks))
 
-            for entity in entities:
-                batch.delete(entity.key)
-                deleted_count += 1
-                batch_count += 1
+    async def cleanup_old_logs(self, days_to_keep: int = 90) -> int:
+        """Clean up activity logs (and their daily rollups) older than specified days"""
+        try:
+            cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
 
-                # Datastore batch limit is 500
-                if batch_count >= 500:
-                    batch.commit()
-                    batch = self.client.batch()
-                    batch_count = 0
+            query = self.client.query(kind=self.kind)
+            query.add_filter("timestamp", "<", cutoff_date)
+            deleted_count = await self._delete_matching(query)
 
-            # Commit remaining deletes
-            if batch_count > 0:
-                batch.commit()
+            # Rollups of days entirely before the cutoff
+            rollup_query = self.client.query(kind=ROLLUP_KIND)
+            rollup_query.add_filter("day_bucket", "<", cutoff_date.date().isoformat())
+            deleted_rollups = await self._delete_matching(rollup_query)
 
-            logger.info(f"Cleaned up {deleted_count} old activity logs")
+            logger.info(
+                f"Cleaned up {deleted_count} old activity logs "
+                f"and {deleted_rollups} daily rollups"
+            )
             return deleted_count
 
         except Exception as e:
@@ -1,14 +1,22 @@
 """
 Form extraction service for handling AI analysis and data storage.
 """
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
-from database.firestore import ImageData, upsert_image, get_image
+from database.firestore import ImageData, batched_upsert, get_image_size
 from chain.completions import TicketChatBot
 from properties.config import Configuration
 
 logger = logging.getLogger(__name__)
 
+# Cap concurrent LLM calls per process; the analysis (image read, base64
+# encode, HTTP call) runs on its own threads so the event loop stays free
+LLM_MAX_CONCURRENCY = Configuration.OPENAI_MAX_CONCURRENCY
+_LLM_SEM = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+_LLM_EXEC = ThreadPoolExecutor(max_workers=LLM_MAX_CONCURRENCY, thread_name_prefix="llm")
+
 
 class ExtractionService:
     """Service for handling form extraction operations."""
@@ -35,7 +43,10 @@ class ExtractionService:
         logger.info(f"Starting AI analysis for {image_path}")
         
         try:
-            result = await self.bot.analyze_ticket(image_path, "")
+            async with _LLM_SEM:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    _LLM_EXEC, self.bot.analyze_ticket_sync, image_path, ""
+                )
             
             # Ensure result is a dictionary
             if not isinstance(result, dict):
@@ -69,9 +80,6 @@ class ExtractionService:
                 "analysis_result": analysis_result,
             }
             
-            upsert_image(form_data, self.form_extract_collection, image_data["ImageName"])
-            logger.info(f"Saved form extraction result: {image_data['ImageName']}")
-            
             # Update image status in image detail collection
             image_metadata = ImageData(
                 Status="Completed",
@@ -82,7 +90,12 @@ class ExtractionService:
                 Size=image_data["Size"],
             )
             
-            upsert_image(image_metadata, self.image_detail_collection, image_data["ImageName"])
+            # Both documents go out in one batched write (single round trip)
+            await asyncio.to_thread(batched_upsert, [
+                (self.form_extract_collection, image_data["ImageName"], form_data),
+                (self.image_detail_collection, image_data["ImageName"], image_metadata),
+            ])
+            logger.info(f"Saved form extraction result: {image_data['ImageName']}")
             logger.info(f"Updated image status to Completed: {image_data['ImageName']}")
             
         except Exception as e:
@@ -104,8 +117,7 @@ class ExtractionService:
             return provided_size
         
         try:
-            existing_meta = get_image(image_name, self.image_detail_collection) or {}
-            return existing_meta.get("Size", 0.0)
+            return get_image_size(image_name, self.image_detail_collection)
         except Exception as e:
             logger.warning(f"Could not get fallback size for {image_name}: {e}")
             return 0.0
@@ -2,12 +2,13 @@
 Main form extraction service that orchestrates the entire process.
 """
 import logging
+from functools import lru_cache
 from typing import Dict, Any
 from fastapi import HTTPException
 from .image_processor import ImageProcessor
 from .extraction_service import ExtractionService
 from properties.config import Configuration
-from chain.completions import TicketChatBot
+from chain.completions import get_bot
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +19,7 @@ class FormExtractionService:
     def __init__(self, config: Configuration):
         self.config = config
         self.image_processor = ImageProcessor(config)
-        self.extraction_service = ExtractionService(config, TicketChatBot(config))
+        self.extraction_service = ExtractionService(config, get_bot())
     
     async def process_form_extraction(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -66,10 +67,6 @@ class FormExtractionService:
         except Exception as e:
             logger.error(f"Form extraction failed for {data['ImageName']}: {str(e)}")
             
-            # Cleanup temporary file on error
-            if local_path:
-                self.image_processor.cleanup_temp_file(local_path)
-            
             # Convert to HTTPException for proper error handling
             if isinstance(e, HTTPException):
                 raise
@@ -102,3 +99,9 @@ class FormExtractionService:
         except Exception as e:
             logger.error(f"Upload and extract failed: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
+
+
+@lru_cache(maxsize=1)
+def get_form_extraction_service() -> FormExtractionService:
+    """Process-wide FormExtractionService sharing the cached TicketChatBot."""
+    return FormExtractionService(Configuration())
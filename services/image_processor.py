@@ -10,6 +10,16 @@ from properties.config import Configuration
 
 logger = logging.getLogger(__name__)
 
+# Upload folders already created by this process
+_created_upload_dirs = set()
+
+
+def _ensure_upload_dir(path: str):
+    """Create the upload folder once per process instead of per instance."""
+    if path not in _created_upload_dirs:
+        os.makedirs(path, exist_ok=True)
+        _created_upload_dirs.add(path)
+
 
 class ImageProcessor:
     """Service for handling image processing operations."""
@@ -19,7 +29,7 @@ class ImageProcessor:
         self.upload_folder = config.UPLOAD_FOLDER
         
         # Ensure upload directory exists
-        os.makedirs(self.upload_folder, exist_ok=True)
+        _ensure_upload_dir(self.upload_folder)
     
     async def download_image(self, image_url: str, filename: str) -> str:
         """
@@ -60,13 +70,19 @@ class ImageProcessor:
             FileValidationError: If validation fails
         """
         try:
+            # One stat shared by every check in the validator
+            file_stat = os.stat(file_path)
             validate_upload_file(
                 file_path,
                 self.config.MAX_FILE_SIZE,
-                self.config.ALLOWED_EXTENSIONS
+                self.config.ALLOWED_EXTENSIONS,
+                file_stat,
             )
             logger.info(f"File validation successful: {file_path}")
             return True
+        except FileNotFoundError:
+            logger.error(f"File validation failed: {file_path} does not exist")
+            raise FileValidationError("File does not exist")
         except FileValidationError as e:
             logger.error(f"File validation failed: {str(e)}")
             self.cleanup_temp_file(file_path)
@@ -84,9 +100,10 @@ class ImageProcessor:
             file_path: Path to the file to remove
         """
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                logger.info(f"Cleaned up temporary file: {file_path}")
+            os.remove(file_path)
+            logger.info(f"Cleaned up temporary file: {file_path}")
+        except FileNotFoundError:
+            pass
         except OSError as e:
             logger.warning(f"Could not remove temporary file {file_path}: {e}")
     
@@ -101,7 +118,7 @@ class ImageProcessor:
             float: File size in MB
         """
         try:
-            size_bytes = os.path.getsize(file_path)
+            size_bytes = os.stat(file_path).st_size
             return round(size_bytes / (1024 * 1024), 2)
         except OSError as e:
             logger.warning(f"Could not get file size for {file_path}: {e}")
@@ -1,16 +1,22 @@
+import contextlib
 import os
-import time
 import logging
-from typing import Dict, Any
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
 
+import openai
+import requests
 from celery import states
+from celery.signals import worker_process_init
+from google.api_core.exceptions import PreconditionFailed, ServerError, TooManyRequests
 
 from celery_app import celery_app
 
-from database.firestore import ImageData, upsert_image, get_image
-from database.ggc_storage import upload_image_to_gcs
+from database.firestore import ImageData, batched_upsert, upsert_image
+from database.ggc_storage import download_blob_to_memory, get_storage_client, parse_gcs_url, upload_fileobj_to_gcs
 from utils.file_processing import download_image_from_url_sync
-from chain.completions import TicketChatBot
+from chain.completions import get_bot
 from properties.config import Configuration
 
 # Configure logger
@@ -18,18 +24,89 @@ logger = logging.getLogger(__name__)
 
 # Initialize configuration
 _config = Configuration()
-_bot = TicketChatBot(_config)
 
 # Create upload directory
 os.makedirs(_config.UPLOAD_FOLDER, exist_ok=True)
 
+# Cap concurrent OpenAI calls in this worker process (threaded/green pools);
+# extra tasks wait here instead of running into rate limits
+_OPENAI_SEM = threading.BoundedSemaphore(_config.OPENAI_MAX_CONCURRENCY)
 
-def _timestamp_name(ext: str) -> str:
-    return time.strftime("%Y%m%d_%H%M%S") + f"_{int(time.time()*1000)%1000:03d}{ext}"
 
+@worker_process_init.connect
+def _init_worker_process(**kwargs):
+    """Build the chat bot and storage client once per worker process.
 
-@celery_app.task(bind=True, name="tasks.upload_image")
-def upload_image_task(self, temp_local_path: str, original_filename: str, status: str, folder_path: str) -> Dict[str, Any]:
+    Building them at import would happen in the prefork parent and hand every
+    child a copy of the parent's HTTP clients; both getters cache per process.
+    """
+    get_bot()
+    get_storage_client()
+
+
+def timestamp_name(ext: str) -> Tuple[str, str]:
+    """Return (image name, timestamp) for a new upload.
+
+    One clock read for both the seconds and the millisecond suffix; UTC like
+    the names generated by the synchronous upload endpoint.
+    """
+    now = datetime.utcnow()
+    timestamp = f"{now:%Y%m%d_%H%M%S}_{now.microsecond // 1000:03d}"
+    return timestamp + ext, timestamp
+
+
+def _analyze_image(image_name: str, image_url: str) -> Dict[str, Any]:
+    """Run the AI analysis, reading images stored in GCS straight into memory."""
+    gcs_location = parse_gcs_url(image_url)
+    if gcs_location:
+        logger.info(f"Reading image from GCS: {image_url}")
+        image_bytes = download_blob_to_memory(*gcs_location)
+        with _OPENAI_SEM:
+            return get_bot().analyze_ticket_bytes_sync(image_bytes, "")
+
+    # Other URLs: download to a temporary file using the synchronous method
+    # (avoid asyncio.run conflicts)
+    local_path = os.path.join(_config.UPLOAD_FOLDER, image_name)
+    logger.info(f"Downloading image from {image_url}")
+    try:
+        download_image_from_url_sync(image_url, local_path)
+        with _OPENAI_SEM:
+            return get_bot().analyze_ticket_sync(local_path, "")
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(local_path)
+
+
+# Transient failures (network, GCP 5xx/429, OpenAI connection/rate limits)
+# are retried with exponential backoff and full jitter, so workers don't all
+# retry in lockstep after an outage
+_RETRY_POLICY = dict(
+    autoretry_for=(
+        requests.ConnectionError,
+        requests.Timeout,
+        ServerError,
+        TooManyRequests,
+        openai.APIConnectionError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+    ),
+    max_retries=5,
+    retry_backoff=2,
+    retry_backoff_max=120,
+    retry_jitter=True,
+)
+
+
+@celery_app.task(bind=True, name="tasks.upload_image", **_RETRY_POLICY)
+def upload_image_task(
+    self,
+    temp_local_path: str,
+    original_filename: str,
+    status: str,
+    folder_path: str,
+    image_name: Optional[str] = None,
+    created_at: Optional[str] = None,
+) -> Dict[str, Any]:
     """Upload image (stored temporarily) to GCS & Firestore.
 
     Args:
@@ -37,40 +114,57 @@ def upload_image_task(self, temp_local_path: str, original_filename: str, status
         original_filename: Original name from client (for extension extraction only).
         status: Initial status (e.g., 'Uploaded').
         folder_path: Optional logical folder path.
+        image_name, created_at: Name chosen at enqueue time (see timestamp_name),
+            so every autoretry writes the same blob; generated here if omitted.
     Returns metadata similar to synchronous endpoint.
     """
-    try:
+    if not image_name:
         ext = os.path.splitext(original_filename or "")[1].lower() or ".jpg"
-        image_name = _timestamp_name(ext)
-        destination_blob_name = f"{folder_path}/{image_name}" if folder_path else image_name
+        image_name, created_at = timestamp_name(ext)
+    destination_blob_name = f"{folder_path}/{image_name}" if folder_path else image_name
 
-        upload_image_to_gcs(
-            bucket_name=_config.BUCKET_NAME,
-            source_file_path=temp_local_path,
-            destination_blob_name=destination_blob_name,
-        )
+    gcs_url = f"https://storage.googleapis.com/{_config.BUCKET_NAME}/{destination_blob_name}"
 
-        gcs_url = f"https://storage.googleapis.com/{_config.BUCKET_NAME}/{destination_blob_name}"
-        file_size_mb = round(os.path.getsize(temp_local_path) / (1024 * 1024), 2)
-        meta = ImageData(
-            Status=status,
-            ImageName=image_name,
-            ImagePath=gcs_url,
-            CreatedAt=image_name.split(ext)[0],  # reuse timestamp portion
-            FolderPath=folder_path,
-            Size=file_size_mb,
-        )
-        upsert_image(meta, _config.COLLECTION_NAME_IMAGE_DETAIL, meta.ImageName)
-        try:
-            os.remove(temp_local_path)
-        except OSError:
-            pass
-        return {"image_name": image_name, "url": gcs_url, "status": status}
-    except Exception as e:  # pragma: no cover
+    retrying = False
+    try:
+        # Stream the handed-off file straight to GCS; its size comes from the
+        # open descriptor so the file isn't stat'ed again after the upload
+        with open(temp_local_path, "rb") as f:
+            size_bytes = os.fstat(f.fileno()).st_size
+            meta = ImageData(
+                Status=status,
+                ImageName=image_name,
+                ImagePath=gcs_url,
+                CreatedAt=created_at,
+                FolderPath=folder_path,
+                Size=round(size_bytes / (1024 * 1024), 2),
+            )
+            try:
+                upload_fileobj_to_gcs(
+                    bucket_name=_config.BUCKET_NAME,
+                    file_obj=f,
+                    destination_blob_name=destination_blob_name,
+                    size=size_bytes,
+                    if_generation_match=0,
+                )
+            except PreconditionFailed:
+                # Already uploaded by an earlier attempt that failed afterwards
+                logger.info(f"{destination_blob_name} already uploaded; reusing it")
+        # Written only once the object exists, so a listed image can always be
+        # read by the extraction worker and a killed upload leaves no row behind
+        upsert_image(meta, _config.COLLECTION_NAME_IMAGE_DETAIL, image_name)
+    except _RETRY_POLICY["autoretry_for"]:
+        retrying = self.max_retries is None or self.request.retries < self.max_retries
         raise
+    finally:
+        # Keep the handed-off file only when an autoretry will need it again
+        if not retrying:
+            with contextlib.suppress(OSError):
+                os.remove(temp_local_path)
+    return {"image_name": image_name, "url": gcs_url, "status": status}
 
 
-@celery_app.task(bind=True, name="tasks.extract_form")
+@celery_app.task(bind=True, name="tasks.extract_form", **_RETRY_POLICY)
 def extract_form_task(
     self,
     image_name: str,
@@ -80,46 +174,21 @@ def extract_form_task(
     created_at: str,
     folder_path: str,
 ) -> Dict[str, Any]:
-    """Perform form extraction (OpenAI + Firestore updates)."""
-    local_path = os.path.join(_config.UPLOAD_FOLDER, image_name)
+    """Perform form extraction (OpenAI + Firestore updates).
+
+    The enqueueing endpoint has already marked the image as Processing and
+    filled in any metadata missing from the request, so no pre-read is needed.
+    """
     try:
         logger.info(f"Starting form extraction for {image_name}")
-        
-        # Mark image status as Processing immediately (avoid duplicate clicks client-side)
-        try:
-            existing = get_image(image_name, _config.COLLECTION_NAME_IMAGE_DETAIL) or {}
-            processing_meta = ImageData(
-                Status="Processing",
-                ImageName=image_name,
-                ImagePath=image_url,
-                CreatedAt=created_at or existing.get("CreatedAt", ""),
-                FolderPath=folder_path or existing.get("FolderPath", ""),
-                Size=size or existing.get("Size", 0.0),
-            )
-            upsert_image(processing_meta, _config.COLLECTION_NAME_IMAGE_DETAIL, image_name)
-            logger.info(f"Marked {image_name} as Processing")
-        except Exception as e:
-            # Non-fatal – continue extraction even if we cannot pre-mark
-            logger.warning(f"Could not mark image as Processing: {e}")
-        
-        # Download image using synchronous method (avoid asyncio.run conflicts)
-        logger.info(f"Downloading image from {image_url}")
-        download_image_from_url_sync(image_url, local_path)
-        logger.info(f"Download completed for {image_name}")
 
         # Analyze (synchronous wrapper)
         logger.info(f"Starting AI analysis for {image_name}")
-        result = _bot.analyze_ticket_sync(local_path, "")
+        result = _analyze_image(image_name, image_url)
         if not isinstance(result, dict):
             result = {"raw": str(result)}
         logger.info(f"AI analysis completed for {image_name}")
 
-        # Determine size fallback (reuse previously fetched existing if available)
-        if not size:
-            if 'existing' not in locals():
-                existing = get_image(image_name, _config.COLLECTION_NAME_IMAGE_DETAIL) or {}
-            size = existing.get("Size", 0.0)
-
         # Save extraction result to forminformation collection
         form_doc = {
             "Status": "Completed",
@@ -130,9 +199,6 @@ def extract_form_task(
             "Size": size,
             "analysis_result": result,
         }
-        upsert_image(form_doc, _config.COLLECTION_NAME_FORM_EXTRACT, image_name)
-        logger.info(f"Saved form extraction result for {image_name}")
-
         # Update status in imagedetail
         meta = ImageData(
             Status="Completed",
@@ -142,24 +208,16 @@ def extract_form_task(
             FolderPath=folder_path,
             Size=size,
         )
-        upsert_image(meta, _config.COLLECTION_NAME_IMAGE_DETAIL, image_name)
+        # Both documents go out in one batched write (single round trip)
+        batched_upsert([
+            (_config.COLLECTION_NAME_FORM_EXTRACT, image_name, form_doc),
+            (_config.COLLECTION_NAME_IMAGE_DETAIL, image_name, meta),
+        ])
+        logger.info(f"Saved form extraction result for {image_name}")
         logger.info(f"Updated image status to Completed for {image_name}")
 
-        # Clean up temporary file
-        try:
-            os.remove(local_path)
-            logger.info(f"Cleaned up temporary file: {local_path}")
-        except OSError as e:
-            logger.warning(f"Could not remove temporary file {local_path}: {e}")
-        
         logger.info(f"Form extraction completed successfully for {image_name}")
         return {"image_name": image_name, "analysis_result": result}
     except Exception as e:
         logger.error(f"Form extraction failed for {image_name}: {str(e)}")
-        # Clean up temporary file on error
-        try:
-            if os.path.exists(local_path):
-                os.remove(local_path)
-        except OSError:
-            pass
         raise
@@ -1,5 +1,7 @@
 import os
 import uuid
+from google.api_core.exceptions import Aborted, DeadlineExceeded
+from google.api_core.retry import Retry, if_exception_type
 from google.cloud import firestore
 
 # Gán đường dẫn tới file JSON key
@@ -53,7 +55,17 @@ documents = [
 
 ]
 
-for doc in documents:
+# Firestore cho phép tối đa 500 thao tác mỗi batch commit
+BATCH_SIZE = 500
+commit_retry = Retry(predicate=if_exception_type(Aborted, DeadlineExceeded))
+
+batch = db.batch()
+for i, doc in enumerate(documents, 1):
     doc_ref = db.collection("imagedetail").document(doc['ImageName'])
-    doc_ref.set(doc)
+    batch.set(doc_ref, doc)
+    if i % BATCH_SIZE == 0:
+        batch.commit(retry=commit_retry)
+        batch = db.batch()
+if len(documents) % BATCH_SIZE:
+    batch.commit(retry=commit_retry)
 print("Test")
\ No newline at end of file
@@ -1,15 +1,22 @@
+import os
 from google.cloud import storage
 
+# Files larger than this use a resumable upload in chunks of this size;
+# smaller ones go up in a single multipart request
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Initialize a client once and reuse it for every upload
+storage_client = storage.Client()
+
 def upload_image_to_gcs(bucket_name, source_file_path, destination_blob_name):
     """Uploads an image to the Google Cloud Storage bucket."""
-    # Initialize a client
-    storage_client = storage.Client()
-    
     # Get the bucket
     bucket = storage_client.bucket(bucket_name)
     
     # Create a blob object from the filepath
     blob = bucket.blob(destination_blob_name)
+    if os.path.getsize(source_file_path) > CHUNK_SIZE:
+        blob.chunk_size = CHUNK_SIZE
     
     # Upload the file to the blob
     blob.upload_from_filename(source_file_path)
@@ -1,4 +1,5 @@
 import json
+import orjson
 import pandas as pd
 from pathlib import Path
 
@@ -14,6 +15,13 @@ def save_json_to_file(data: dict, file_path: str | Path, ensure_ascii: bool = Fa
     path = Path(file_path)
     path.parent.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
 
+    # orjson writes UTF-8, either compact or indented by 2 spaces; anything
+    # else (escaped output, other indents) goes through the stdlib encoder
+    if not ensure_ascii and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        path.write_bytes(orjson.dumps(data, option=option))
+        return
+
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=ensure_ascii, indent=indent)
 
@@ -30,8 +38,25 @@ def flatten_json(json_obj: dict) -> dict:
             flat[key] = value
     return flat
 
+def _expand_list_column(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Spread the list values of column `key` into key_1, key_2, ... columns (as flatten_json does)."""
+    is_list = df[key].map(lambda value: isinstance(value, list))
+    expanded = pd.DataFrame(df.loc[is_list, key].tolist(), index=df.index[is_list])
+    expanded.columns = [f"{key}_{i+1}" for i in range(expanded.shape[1])]
+    position = df.columns.get_loc(key)
+    if is_list.all():
+        df = df.drop(columns=key)
+    else:
+        df[key] = df[key].mask(is_list)
+        position += 1
+    return pd.concat([df.iloc[:, :position], expanded, df.iloc[:, position:]], axis=1)
+
 def export_json_list_to_excel(json_list: list[dict], output_path: str | Path = "output.xlsx"):
-    flattened = [flatten_json(record) for record in json_list]
-    df = pd.DataFrame(flattened)
+    # Same columns as flatten_json: one level of dicts becomes "key.sub_key",
+    # done by pandas in one pass; top-level lists are then split into columns
+    df = pd.json_normalize(json_list, sep=".", max_level=1)
+    list_keys = {key for record in json_list for key, value in record.items() if isinstance(value, list)}
+    for key in list_keys:
+        df = _expand_list_column(df, key)
     df.to_excel(output_path, index=False)
     print(f"✅ Excel saved: {output_path}")
\ No newline at end of file
@@ -30,50 +30,78 @@ def entity_dtype(entity) -> str:
         return "boolean"
 
 
-def transform(input_data: dict) -> dict:
-    # Schema kết quả đầu ra chuẩn
-    output = {
-        "ho_va_ten": "",
-        "cccd": "",
-        "dien_thoai": "",
-        "email": "",
-        "truong_thpt": "",
-        "lop": "",
-        "tinh": "",
-        "dien_thoai_phu_huynh": "",
-        "nganh_xet_tuyen": ["", "", ""],
-        "mon_chon_cap_thpt": {
-            "Ngu van": False, "Toan": False, "Lich su": False, "Hoa hoc": False,
-            "Dia ly": False, "GDKT & PL": False, "Vat ly": False, "Sinh hoc": False,
-            "Tin hoc": False, "Cong nghe": False, "Ngoai ngu": False
-        },
-        "mon_thi_tot_nghiep": {
-            "Ngu van": False, "Toan": False, "Mon tu chon 1": "", "Mon tu chon 2": ""
-        },
-        "phuong_thuc_xet_tuyen": {
-            "Xet diem hoc ba THPT": False,
-            "Xet diem thi tot nghiep THPT": False,
-            "Xet diem thi DGNL": False,
-            "Xet diem thi V-SAT": False,
-            "Xet tuyen thang": False
-        }
+# Schema kết quả đầu ra chuẩn (copied for every call in transform)
+_OUTPUT_TEMPLATE = {
+    "ho_va_ten": "",
+    "cccd": "",
+    "dien_thoai": "",
+    "email": "",
+    "truong_thpt": "",
+    "lop": "",
+    "tinh": "",
+    "dien_thoai_phu_huynh": "",
+    "nganh_xet_tuyen": ["", "", ""],
+    "mon_chon_cap_thpt": {
+        "Ngu van": False, "Toan": False, "Lich su": False, "Hoa hoc": False,
+        "Dia ly": False, "GDKT & PL": False, "Vat ly": False, "Sinh hoc": False,
+        "Tin hoc": False, "Cong nghe": False, "Ngoai ngu": False
+    },
+    "mon_thi_tot_nghiep": {
+        "Ngu van": False, "Toan": False, "Mon tu chon 1": "", "Mon tu chon 2": ""
+    },
+    "phuong_thuc_xet_tuyen": {
+        "Xet diem hoc ba THPT": False,
+        "Xet diem thi tot nghiep THPT": False,
+        "Xet diem thi DGNL": False,
+        "Xet diem thi V-SAT": False,
+        "Xet tuyen thang": False
     }
+}
 
-    for key, value in input_data.items():
-        if key not in FIELD_MAPPING:
-            continue
+# Template values that are containers and must be copied, not shared
+_NESTED_KEYS = tuple(key for key, value in _OUTPUT_TEMPLATE.items() if isinstance(value, (dict, list)))
 
-        mapped = FIELD_MAPPING[key]
 
-        if isinstance(mapped, str):
-            if mapped == "nganh_xet_tuyen_1":
-                output["nganh_xet_tuyen"][0] = value
-            else:
-                output[mapped] = value
+def _set_field(field):
+    def setter(output, value):
+        output[field] = value
+    return setter
+
+
+def _set_subfield(group, subfield):
+    def setter(output, value):
+        output[group][subfield] = value
+    return setter
+
+
+def _set_first_major(output, value):
+    output["nganh_xet_tuyen"][0] = value
+
 
+def _build_dispatch() -> dict:
+    """Resolve FIELD_MAPPING once into one setter per input key."""
+    dispatch = {}
+    for key, mapped in FIELD_MAPPING.items():
+        if isinstance(mapped, str):
+            dispatch[key] = _set_first_major if mapped == "nganh_xet_tuyen_1" else _set_field(mapped)
         elif isinstance(mapped, tuple) and len(mapped) == 2:
             group, subfield = mapped
-            if group in output and isinstance(output[group], dict):
-                output[group][subfield] = value
+            if isinstance(_OUTPUT_TEMPLATE.get(group), dict):
+                dispatch[key] = _set_subfield(group, subfield)
+    return dispatch
+
+
+_DISPATCH = _build_dispatch()
+
+
+def transform(input_data: dict) -> dict:
+    output = dict(_OUTPUT_TEMPLATE)
+    for key in _NESTED_KEYS:
+        output[key] = _OUTPUT_TEMPLATE[key].copy()
+
+    for key, value in input_data.items():
+        setter = _DISPATCH.get(key)
+        if setter is not None:
+            setter(output, value)
 
-    return output
\ No newline at end of file
+    return output
@@ -1,8 +1,54 @@
 import os
+import shutil
 from urllib.parse import urlparse
+import aiofiles
 import aiohttp
 import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared session so Celery downloads reuse pooled HTTP connections, retrying
+# transient gateway errors
+_http_session = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+)
+_http_session.mount("http://", _http_adapter)
+_http_session.mount("https://", _http_adapter)
+
+# Connect / read timeouts for sync downloads
+DOWNLOAD_TIMEOUT = (5, 30)
+
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1MB
+
+# Shared aiohttp session for async downloads. It is created on first use
+# because aiohttp sessions must be built inside a running event loop; the
+# getter never awaits, so concurrent callers can't create two.
+_aiohttp_session = None
+ASYNC_DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+
+def _get_aiohttp_session() -> aiohttp.ClientSession:
+    global _aiohttp_session
+    if _aiohttp_session is None or _aiohttp_session.closed:
+        _aiohttp_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300),
+            timeout=ASYNC_DOWNLOAD_TIMEOUT,
+        )
+    return _aiohttp_session
+
+
+async def close_http_session():
+    """Close the shared aiohttp session (call on application shutdown)."""
+    global _aiohttp_session
+    if _aiohttp_session is not None and not _aiohttp_session.closed:
+        await _aiohttp_session.close()
+    _aiohttp_session = None
+
+
 def extract_filename_from_url(url: str) -> str:
     """
     Extract the filename from a full URL.
@@ -16,12 +62,13 @@ async def download_image_from_url(url: str, local_path: str):
     """
     Download an image from a public URL to a local file.
     """
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            if response.status != 200:
-                raise Exception(f"Failed to download image. Status code: {response.status}")
-            with open(local_path, 'wb') as f:
-                f.write(await response.read())
+    async with _get_aiohttp_session().get(url) as response:
+        if response.status != 200:
+            raise Exception(f"Failed to download image. Status code: {response.status}")
+        # Write through aiofiles so disk I/O doesn't block the event loop
+        async with aiofiles.open(local_path, 'wb') as f:
+            async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                await f.write(chunk)
 
 
 def download_image_from_url_sync(url: str, local_path: str):
@@ -29,8 +76,9 @@ def download_image_from_url_sync(url: str, local_path: str):
     Synchronous version of image download for use in Celery tasks.
     Avoids asyncio.run() conflicts in Celery workers.
     """
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    
-    with open(local_path, 'wb') as f:
-        f.write(response.content)
\ No newline at end of file
+    with _http_session.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        # Undo any Content-Encoding while copying the raw stream
+        response.raw.decode_content = True
+        with open(local_path, 'wb') as f:
+            shutil.copyfileobj(response.raw, f, DOWNLOAD_CHUNK_SIZE)
\ No newline at end of file
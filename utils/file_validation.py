@@ -6,8 +6,27 @@ import os
 from typing import Optional
 import logging
 
+from properties.config import get_settings
+
 logger = logging.getLogger(__name__)
 
+# Accepted image formats, identified by their leading bytes
+_IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"BM", "image/bmp"),
+)
+_HEADER_SIZE = 16
+
+# MIME types accepted by the optional libmagic check
+_ALLOWED_MIME_TYPES = {
+    "image/jpeg",
+    "image/jpg",
+    "image/png",
+    "image/bmp",
+    "image/webp",
+}
+
 # Try to import magic, fallback to basic validation if not available
 try:
     import magic
@@ -24,6 +43,24 @@ class FileValidationError(Exception):
     pass
 
 
+def sniff_image_type(file_path: str) -> Optional[str]:
+    """
+    Detect the image type from the file's first bytes.
+
+    Returns:
+        Optional[str]: MIME type of a supported image, or None
+    """
+    with open(file_path, "rb") as f:
+        header = f.read(_HEADER_SIZE)
+    for signature, mime_type in _IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return mime_type
+    # WEBP is a RIFF container: "RIFF" <size> "WEBP"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
 def validate_image_file(file_path: str, allowed_extensions: set = None) -> bool:
     """
     Validate image file using both extension and MIME type checking.
@@ -42,10 +79,6 @@ def validate_image_file(file_path: str, allowed_extensions: set = None) -> bool:
         allowed_extensions = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
 
     try:
-        # Check if file exists
-        if not os.path.exists(file_path):
-            raise FileValidationError("File does not exist")
-
         # Check file extension
         _, ext = os.path.splitext(file_path.lower())
         if ext not in allowed_extensions:
@@ -53,37 +86,28 @@ def validate_image_file(file_path: str, allowed_extensions: set = None) -> bool:
                 f"File extension {ext} not allowed. Allowed: {allowed_extensions}"
             )
 
-        # Check MIME type using python-magic if available
-        if MAGIC_AVAILABLE:
+        # Check the content really is a supported image (signature sniffing)
+        # (opening the file also tells us whether it exists)
+        try:
+            mime_type = sniff_image_type(file_path)
+        except FileNotFoundError:
+            raise FileValidationError("File does not exist")
+        if mime_type is None:
+            raise FileValidationError(
+                "File is not a supported image (JPEG, PNG, BMP or WEBP)"
+            )
+
+        # Optional libmagic check on top of the signature check
+        if MAGIC_AVAILABLE and get_settings().FILE_VALIDATION_USE_MAGIC:
             try:
                 mime_type = magic.from_file(file_path, mime=True)
-                if not mime_type.startswith("image/"):
-                    raise FileValidationError(
-                        f"File is not an image. Detected MIME type: {mime_type}"
-                    )
-
-                # Additional validation for specific image types
-                allowed_mime_types = {
-                    "image/jpeg",
-                    "image/jpg",
-                    "image/png",
-                    "image/bmp",
-                    "image/webp",
-                }
-
-                if mime_type not in allowed_mime_types:
-                    raise FileValidationError(f"MIME type {mime_type} not allowed")
-
-                logger.info(f"MIME type validation successful: {mime_type}")
-
             except Exception as e:
                 logger.warning(f"Could not validate MIME type for {file_path}: {e}")
-                # Fallback to extension-only validation if magic fails
-                logger.info(f"Using extension-only validation for {file_path}")
-        else:
-            logger.info(
-                f"Using extension-only validation for {file_path} (magic not available)"
-            )
+            else:
+                if mime_type not in _ALLOWED_MIME_TYPES:
+                    raise FileValidationError(f"MIME type {mime_type} not allowed")
+
+        logger.debug(f"Image type validation successful: {mime_type}")
 
         return True
 
@@ -93,13 +117,18 @@ def validate_image_file(file_path: str, allowed_extensions: set = None) -> bool:
         raise FileValidationError(f"Unexpected error during file validation: {str(e)}")
 
 
-def validate_file_size(file_path: str, max_size_bytes: int = 10485760) -> bool:
+def validate_file_size(
+    file_path: str,
+    max_size_bytes: int = 10485760,
+    file_stat: Optional[os.stat_result] = None,
+) -> bool:
     """
     Validate file size.
 
     Args:
         file_path: Path to the file
         max_size_bytes: Maximum allowed file size in bytes (default: 10MB)
+        file_stat: Result of os.stat(file_path) if the caller already has it
 
     Returns:
         bool: True if file size is valid
@@ -108,7 +137,9 @@ def validate_file_size(file_path: str, max_size_bytes: int = 10485760) -> bool:
         FileValidationError: If file is too large
     """
     try:
-        file_size = os.path.getsize(file_path)
+        file_size = (
+            file_stat.st_size if file_stat is not None else os.path.getsize(file_path)
+        )
         if file_size > max_size_bytes:
             raise FileValidationError(
                 f"File size {file_size} bytes exceeds maximum allowed size {max_size_bytes} bytes"
@@ -119,7 +150,10 @@ def validate_file_size(file_path: str, max_size_bytes: int = 10485760) -> bool:
 
 
 def validate_upload_file(
-    file_path: str, max_size_bytes: int = 10485760, allowed_extensions: set = None
+    file_path: str,
+    max_size_bytes: int = 10485760,
+    allowed_extensions: set = None,
+    file_stat: Optional[os.stat_result] = None,
 ) -> bool:
     """
     Comprehensive file validation for uploads.
@@ -128,6 +162,7 @@ def validate_upload_file(
         file_path: Path to the uploaded file
         max_size_bytes: Maximum allowed file size
         allowed_extensions: Set of allowed file extensions
+        file_stat: Result of os.stat(file_path) if the caller already has it
 
     Returns:
         bool: True if file passes all validations
@@ -135,8 +170,17 @@ def validate_upload_file(
     Raises:
         FileValidationError: If any validation fails
     """
+    # Stat once and share the result with both checks
+    if file_stat is None:
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
+            raise FileValidationError("File does not exist")
+        except OSError as e:
+            raise FileValidationError(f"Error checking file size: {str(e)}")
+
     # Validate file size
-    validate_file_size(file_path, max_size_bytes)
+    validate_file_size(file_path, max_size_bytes, file_stat)
 
     # Validate file type and content
     validate_image_file(file_path, allowed_extensions)
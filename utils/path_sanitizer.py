@@ -6,6 +6,10 @@ import re
 from pathlib import PurePosixPath
 from fastapi import HTTPException
 
+# Allowed folder path characters: alphanumeric, underscore, hyphen, slash.
+# \Z rather than $, which would also accept a trailing newline
+_FOLDER_PATH_RE = re.compile(r"\A[\w\-/]+\Z")
+
 
 def sanitize_folder_path(folder_path: str) -> str:
     """
@@ -33,7 +37,7 @@ def sanitize_folder_path(folder_path: str) -> str:
     folder_path = folder_path.strip()
 
     # Allow only alphanumeric, underscore, hyphen, and forward slash
-    if not re.match(r"^[\w\-/]+$", folder_path):
+    if not _FOLDER_PATH_RE.match(folder_path):
         raise HTTPException(
             status_code=400,
             detail="Invalid folder path. Only alphanumeric characters, underscores, hyphens, and forward slashes are allowed.",